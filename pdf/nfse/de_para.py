@@ -2,6 +2,8 @@
 Dicionário de de-para para códigos tributários nacionais (cod_trib_nac).
 Mapeia códigos para suas descrições completas.
 """
+import textwrap
+
 CODIGO_TRIB_NAC = {
     "010101": "Análise e desenvolvimento de sistemas.",
     "010201": "Programação.",
@@ -341,103 +343,78 @@ CODIGO_TRIB_NAC = {
 }
 
 
-def de_para_reg_esp_trib(value):
-    if value == '0':
-        return 'Nenhum'
-    
-    elif value == '1':
-        return 'Ato Cooperado (Cooperativa)'
-    
-    elif value == '2':
-        return 'Estimativa'
-    
-    elif value == '3':
-        return 'Micro Empresa Municipal'
+REG_ESP_TRIB = {
+    '0': 'Nenhum',
+    '1': 'Ato Cooperado (Cooperativa)',
+    '2': 'Estimativa',
+    '3': 'Micro Empresa Municipal',
+    '4': 'Notário ou Registrador',
+    '5': 'Profissional Autonomo',
+    '6': 'Sociedade de Profissionais',
+}
+
+TIPO_IMUN_ISSQN = {
+    '0': 'Imunidade (tipo não informado na nota de origem)',
+    '1': 'Patrimônio, renda ou serviços, uns dos outros (CF88, Art 150, VI, a)',
+    '2': 'Entidades religiosas e templos de qualquer culto, inclusive suas organizações assistenciais e beneficentes (CF88, Art 150, VI, b)',
+    '3': 'Patrimônio, renda ou serviços dos partidos políticos, inclusive suas fundações, das entidades sindicais dos trabalhadores, das instituições de educação e de assistência social, sem fins lucrativos, atendidos os requisitos da lei (CF88, Art 150, VI, c)',
+    '4': 'Livros, jornais, periódicos e o papel destinado a sua impressão (CF88, Art 150, VI, d)',
+    '5': 'Fonogramas e videofonogramas musicais produzidos no Brasil contendo obras musicais ou literomusicais de autores brasileiros e/ou obras em geral interpretadas por artistas brasileiros bem como os suportes materiais ou arquivos digitais que os contenham, salvo na etapa de replicação industrial de mídias ópticas de leitura a laser.   (CF88, Art 150, VI, e)',
+}
 
-    elif value == '4':
-        return 'Notário ou Registrador'
+REGIME_ESPECIAL_TRIB = {
+    '0': 'Nenhum',
+    '1': 'Ato Cooperado (Cooperativa)',
+    '2': 'Estimativa',
+}
 
-    elif value == '5':
-        return 'Profissional Autonomo'
+SUSP_ISSQN = {
+    '1': 'Exigibilidade do ISSQN suspensa por decião judicial',
+    '2': 'Exigibilidade do ISSQN suspensa por processo administrativo',
+}
 
-    elif value == '6':
-        return 'Sociedade de Profissionais'
-    else:
-        '-'
+TRIB_ISSQN = {
+    '1': 'Operação tributável',
+    '2': 'Imunidade',
+    '3': 'Exportação de serviços',
+    '4': 'Não Incidência',
+}
+
+TP_RET_PIS_COFINS = {
+    '1': 'Retido',
+    '2': 'Não Retido',
+    '3': 'PIS Retido/COFINS Não Retido',
+    '4': 'PIS Não Retido/COFINS Retido',
+}
+
+NIF_N_INFORMADO = {
+    '0': 'Não informado na origem',
+    '1': 'Dispensado do NIF',
+    '2': 'Não exigência do NIF',
+}
+
+
+def de_para_reg_esp_trib(value):
+    return REG_ESP_TRIB.get(value, '-')
 
 
 def de_para_tipo_imun_issqn(codigo: str) -> str:
-    if codigo == '0':
-        return 'Imunidade (tipo não informado na nota de origem)'
-    
-    if codigo == '1':
-        return 'Patrimônio, renda ou serviços, uns dos outros (CF88, Art 150, VI, a)'
-    
-    if codigo == '2':
-        return 'Entidades religiosas e templos de qualquer culto, inclusive suas organizações assistenciais e beneficentes (CF88, Art 150, VI, b)'
-    
-    if codigo == '3':
-        return 'Patrimônio, renda ou serviços dos partidos políticos, inclusive suas fundações, das entidades sindicais dos trabalhadores, das instituições de educação e de assistência social, sem fins lucrativos, atendidos os requisitos da lei (CF88, Art 150, VI, c)'
-    
-    if codigo == '4':
-        return 'Livros, jornais, periódicos e o papel destinado a sua impressão (CF88, Art 150, VI, d)'
-    
-    if codigo == '5':
-        return 'Fonogramas e videofonogramas musicais produzidos no Brasil contendo obras musicais ou literomusicais de autores brasileiros e/ou obras em geral interpretadas por artistas brasileiros bem como os suportes materiais ou arquivos digitais que os contenham, salvo na etapa de replicação industrial de mídias ópticas de leitura a laser.   (CF88, Art 150, VI, e)'
-    
-    return '-'
+    return TIPO_IMUN_ISSQN.get(codigo, '-')
 
 def de_para_regime_especial_trib(codigo: str):
-    if codigo == '0':
-        return 'Nenhum'
-    
-    if codigo == '1':
-        return 'Ato Cooperado (Cooperativa)'
-    
-    if codigo == '2':
-        return 'Estimativa'
+    return REGIME_ESPECIAL_TRIB.get(codigo)
 
 def de_para_susp_issqn(codigo: str):
-    if codigo == '1':
-        return 'Exigibilidade do ISSQN suspensa por decião judicial'
-    if codigo == '2':
-        return 'Exigibilidade do ISSQN suspensa por processo administrativo'
-
-    return 'Não'
+    return SUSP_ISSQN.get(codigo, 'Não')
 
 def de_para_trib_issqn(codigo: str):
-    if codigo == '1':
-        return 'Operação tributável'
-    if codigo == '2':
-        return 'Imunidade'
-    if codigo == '3':
-        return 'Exportação de serviços'
-    if codigo == '4':
-        return 'Não Incidência'
-    
-    return '-'
+    return TRIB_ISSQN.get(codigo, '-')
 
 def de_para_tp_ret_pis_cofins(codigo: str):
-    if codigo == '1':
-        return 'Retido'
-    if codigo == '2':
-        return 'Não Retido'
-    if codigo == '3':
-        return 'PIS Retido/COFINS Não Retido'
-    if codigo == '4':
-        return 'PIS Não Retido/COFINS Retido'
-    
-    return '-'
+    return TP_RET_PIS_COFINS.get(codigo, '-')
 
 def de_para_nif_n_informado(codigo: str):
-    if codigo == '0':
-        return 'Não informado na origem'
-    if codigo == '1':
-        return 'Dispensado do NIF'
-    if codigo == '2':
-        return 'Não exigência do NIF'
-
-    return '-'
+    return NIF_N_INFORMADO.get(codigo, '-')
 
 cod_eventos = {
         "e101101": "Cancelada",    # Evento de cancelamento
@@ -460,8 +437,6 @@ cod_eventos = {
     
 
 def formatar_descricao_cod_trib_nac(descricao: str, codigo: str, max_chars: int = 72) -> str:
-    
-    import textwrap
 
     largura_max = 35
 
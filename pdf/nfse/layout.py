@@ -3,6 +3,7 @@ Classe para gerenciar as dimensões e posicionamento dos elementos do PDF.
 Centraliza todos os cálculos de conversão SVG -> PDF.
 """
 
+import logging
 from math import dist
 import sys
 import os
@@ -11,12 +12,17 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
 
 from layout_refactored import PositionManager
 
+logger = logging.getLogger(__name__)
+
 
 class Element:
     """
     Classe base para representar um elemento do PDF.
     Todo elemento tem posição (x, y), valor (conteúdo) e opcionalmente dimensões (width, height).
+    Usa __slots__ pois centenas de elementos são criados a cada PDF gerado.
     """
+
+    __slots__ = ("x", "y", "value", "width", "height")
     
     def __init__(self, x: float, y: float, value, width: float = None, height: float = None):
         """
@@ -43,6 +49,8 @@ class TextElement(Element):
     """
     Elemento de texto que herda de Element e adiciona propriedades de formatação de fonte.
     """
+
+    __slots__ = ("font_size", "font_style", "line_height")
     
     def __init__(self, x: float, y: float, value: str, width: float = None, height: float = None,
                  font_size: int = 10, font_style: str = "", line_height: float = None):
@@ -64,7 +72,7 @@ class TextElement(Element):
         self.font_size = font_size
         self.font_style = font_style
         # line_height controla o espaçamento entre linhas no multi_cell
-        # Se não fornecido, usa height ou padrão de 4mm
+        # Se não fornecido, usa height ou padrão de 4mm, então nunca fica None
         self.line_height = line_height if line_height is not None else (height if height is not None else 4.0)
     
     def __repr__(self):
@@ -79,6 +87,8 @@ class LineElement(Element):
     Elemento de linha horizontal que herda de Element.
     Para uma linha horizontal: x é o início, y é a posição Y, width é o comprimento.
     """
+
+    __slots__ = ("x2", "y2")
     
     def __init__(self, x: float, y: float, width: float, value: str = None):
         """
@@ -2754,7 +2764,7 @@ class Layout:
             y_svg = self.HorizontalLines.VECTOR_POSITIONS[line_name]
             y_mm = self._svg_to_pdf_y(y_svg)
 
-        print(f"line_name: {line_name}, y_mm: {y_mm}")
+        logger.debug("line_name: %s, y_mm: %s", line_name, y_mm)
         
         # Retorna o elemento de linha
         return LineElement(
@@ -3,8 +3,11 @@ Módulo simplificado para cálculo de posições dinâmicas das seções da NFSe
 Usa 3 layouts fixos (hardcoded) para os 3 cenários possíveis.
 """
 
+import logging
 from typing import Dict, List, Optional, Literal
 
+logger = logging.getLogger(__name__)
+
 # Fator de conversão: SVG tem área útil ~595x842px, PDF A4 é 210x297mm
 PX_TO_MM = 210 / 595  # ≈ 0.3529
 BASE_HEIGHT = 40.0 * PX_TO_MM
@@ -148,7 +151,7 @@ def _create_general_layout(top_margin: float, left_margin: float, exclude_sectio
     for section, pos in positions.items():
         positions[section]['y'] = _svg_to_pdf_y(pos['y'], top_margin)
 
-    print(positions)
+    logger.debug("%s", positions)
     
     return positions
     
@@ -428,8 +431,8 @@ class PositionManager:
 
     def _recalculate_positions(self, sections: dict[str, float]):
         
-        print('Lista original ', self.positions)
-        print('Seções a serem recalculadas ', sections)
+        logger.debug('Lista original %s', self.positions)
+        logger.debug('Seções a serem recalculadas %s', sections)
         
         for section, data in sections.items():
             idx = ORDEM_SECOES.index(section)
@@ -449,7 +452,7 @@ class PositionManager:
                 self.positions[section_name]['y'] = next_y
                 next_y = next_y + self.positions[section_name]['height']
 
-        print('Lista recalculada ', self.positions)
+        logger.debug('Lista recalculada %s', self.positions)
 
 
 # ==================== EXEMPLO DE USO ====================
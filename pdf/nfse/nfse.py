@@ -19,17 +19,56 @@ except ImportError:
     from layout import Layout, TextElement
 
 try:
-    from pdf.nfse.qrcode_ import Qrcode
+    from pdf.nfse.qrcode_ import desenhar_qr_code
 except ImportError:
-    from qrcode_ import Qrcode
+    from qrcode_ import desenhar_qr_code
 
 try:
-    from pdf.nfse.de_para import PAISES_ISO, de_para_codigo_trib_nac, de_para_reg_esp_trib, de_para_susp_issqn, de_para_tipo_imun_issqn, de_para_tp_ret_pis_cofins, de_para_trib_issqn
+    from pdf.nfse.de_para import PAISES_ISO, REG_ESP_TRIB, SUSP_ISSQN, TP_RET_PIS_COFINS, TRIB_ISSQN, de_para_codigo_trib_nac
 except ImportError:
-    from de_para import PAISES_ISO, de_para_codigo_trib_nac, de_para_reg_esp_trib, de_para_susp_issqn, de_para_tipo_imun_issqn, de_para_tp_ret_pis_cofins, de_para_trib_issqn
+    from de_para import PAISES_ISO, REG_ESP_TRIB, SUSP_ISSQN, TP_RET_PIS_COFINS, TRIB_ISSQN, de_para_codigo_trib_nac
 
-import xml.etree.ElementTree as ET
+import logging
+import os
+import textwrap
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# lxml faz o parse em C (libxml2)
+from lxml import etree as ET
+
+logger = logging.getLogger(__name__)
+
+# Quebradores de linha reutilizados nos desenhos; textwrap.wrap cria um
+# TextWrapper novo a cada chamada.
+_WRAP_75 = textwrap.TextWrapper(width=75, break_long_words=False)
+_WRAP_75_LONG = textwrap.TextWrapper(width=75, break_long_words=True)
+_WRAP_160 = textwrap.TextWrapper(width=160, break_long_words=False)
+
+# Nome do país a partir do código ISO
+_PAIS = PAISES_ISO.get
+
+# Linhas divisórias desenhadas acima de cada seção, na ordem da página
+_LINHAS_SECOES = (
+    "info_nota",
+    "emitente",
+    "tomador",
+    "intermediario",
+    "servico",
+    "tb_municipal",
+    "trib_federal",
+    "valor_nfse",
+    "totais",
+    "info_complementar",
+)
 
 def formatar_cnpj_cpf_nif(value):
     """
@@ -127,19 +166,376 @@ def formatar_moeda(value):
     except (ValueError, AttributeError, TypeError):
         return value
 
-def de_para_op_simp_nac(value): 
-    if value == '1':
-        return 'Não optante'
-    
-    elif value == '2':
-        return 'Optante - Microempreendor Individual (MEI)'
-    
-    elif value == '3':
-        return 'Optante - Micro Empresa de Pequeno Porte (ME/EPP)'
+def valor_numerico(value):
+    """
+    Converte o valor de uma tag numérica do XML para float.
+    Retorna 0.0 se o valor for vazio ou ausente.
+    """
+    return float(value) if value else 0.0
+
+OP_SIMP_NAC = {
+    '1': 'Não optante',
+    '2': 'Optante - Microempreendor Individual (MEI)',
+    '3': 'Optante - Micro Empresa de Pequeno Porte (ME/EPP)',
+}
+
+def de_para_op_simp_nac(value):
+    return OP_SIMP_NAC.get(value, '-')
+
+
+IBGE_MUNICIPIOS_URL = "https://servicodados.ibge.gov.br/api/v1/localidades/municipios/{}"
+
+# Sessão compartilhada para as consultas ao IBGE: reaproveita a conexão TCP/TLS
+# em vez de abrir uma nova a cada município
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Timeouts de conexão e leitura não são repetidos: cada um já custa o timeout
+    # inteiro, e a falha deve chegar logo ao circuit breaker
+    max_retries=Retry(total=2, connect=0, read=0, backoff_factor=0.2),
+))
+
+
+class _CircuitBreaker:
+    """
+    Suspende as consultas ao IBGE por um tempo após falhas consecutivas, para que
+    uma API lenta ou fora do ar não faça cada PDF esperar todos os timeouts.
+    """
+
+    def __init__(self, max_falhas: int = 2, pausa: float = 30.0):
+        self.max_falhas = max_falhas
+        self.pausa = pausa
+        self.falhas = 0
+        self.aberto_em = 0.0
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.falhas >= self.max_falhas and time.monotonic() - self.aberto_em < self.pausa
+
+    def record_failure(self):
+        with self._lock:
+            self.falhas += 1
+            if self.falhas >= self.max_falhas:
+                self.aberto_em = time.monotonic()
+
+    def record_success(self):
+        with self._lock:
+            self.falhas = 0
 
-    else:
-        '-'
 
+_BREAKER = _CircuitBreaker()
+
+
+class _ConsultaSuspensa(Exception):
+    """Consulta ao IBGE não feita porque o circuit breaker está aberto."""
+
+
+@lru_cache(maxsize=8192)
+def _ibge_municipio(cod_mun: str):
+    """
+    Consulta o nome e a UF de um município na API de localidades do IBGE.
+    O resultado fica em cache no processo, inclusive None para códigos que o
+    IBGE não conhece. Só falhas de conexão, timeouts e respostas 5xx contam para
+    o circuit breaker; elas e a consulta suspensa levantam exceção e, por isso,
+    não são cacheadas.
+    """
+    if _BREAKER.is_open():
+        raise _ConsultaSuspensa(cod_mun)
+
+    try:
+        response = _SESSION.get(IBGE_MUNICIPIOS_URL.format(cod_mun), timeout=(1.0, 2.0))
+    except (requests.ConnectionError, requests.Timeout):
+        _BREAKER.record_failure()
+        raise
+    if response.status_code >= 500:
+        _BREAKER.record_failure()
+        response.raise_for_status()
+    _BREAKER.record_success()
+
+    # 4xx ou resposta sem o município (a API responde 200 com [] para códigos
+    # inexistentes): o código não é conhecido
+    if response.status_code >= 400:
+        return None
+    try:
+        data = response.json()
+        return data["nome"], data['microrregiao']['mesorregiao']['UF']['sigla']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def buscar_municipio(cod_mun) -> tuple:
+    """
+    Retorna o nome e a UF do município pelo código IBGE. Exemplo:
+    '3106200' -> ('Belo Horizonte', 'MG')
+    Retorna ("", "") se o código for vazio ou desconhecido, a consulta falhar
+    ou as consultas estiverem suspensas pelo circuit breaker (municípios já
+    consultados continuam vindo do cache).
+    """
+    if not cod_mun:
+        return "", ""
+
+    try:
+        municipio = _ibge_municipio(str(cod_mun))
+    except _ConsultaSuspensa:
+        logger.debug("Consulta ao IBGE suspensa após falhas; município %s ignorado", cod_mun)
+        return "", ""
+    except requests.RequestException as e:
+        logger.warning("Erro ao consultar o município %s no IBGE: %s", cod_mun, e)
+        return "", ""
+
+    if municipio is None:
+        logger.debug("Município %s não encontrado no IBGE", cod_mun)
+        return "", ""
+    return municipio
+
+
+
+# Campos extraídos do XML: pares (atributo, tag) agrupados pelo elemento
+# em que a tag é buscada.
+_INF_NFSE_FIELDS = (
+    ("x_loc_emi", "xLocEmi"),
+    ("x_loc_prestacao", "xLocPrestacao"),
+    ("n_nfse", "nNFSe"),
+    ("c_loc_incid", "cLocIncid"),
+    ("x_loc_incid", "xLocIncid"),
+    ("x_trib_nac", "xTribNac"),
+    ("ver_aplic", "verAplic"),
+    ("amb_ger", "ambGer"),
+    ("tp_emis", "tpEmis"),
+    ("proc_emi", "procEmi"),
+    ("c_stat", "cStat"),
+    ("dh_proc", "dhProc"),
+    ("n_dfse", "nDFSe"),
+)
+
+_EMIT_FIELDS = (
+    ("emit_cnpj", "CNPJ"),
+    ("emit_x_nome", "xNome"),
+    ("emit_fone", "fone"),
+    ("emit_email", "email"),
+    ("emit_im", "IM"),
+)
+
+_EMIT_ENDER_FIELDS = (
+    ("emit_x_lgr", "xLgr"),
+    ("emit_nro", "nro"),
+    ("emit_x_bairro", "xBairro"),
+    ("emit_c_mun", "cMun"),
+    ("emit_uf", "UF"),
+    ("emit_cep", "CEP"),
+)
+
+_VALORES_FIELDS = (
+    ("v_bc", "vBC"),
+    ("p_aliq_aplic", "pAliqAplic"),
+    ("v_issqn", "vISSQN"),
+    ("v_total_ret", "vTotalRet"),
+    ("v_liq", "vLiq"),
+    ("v_calc_dr", "vCalcDR"),
+    ("v_bm", "vCalcBM"),
+)
+
+_DPS_FIELDS = (
+    ("dps_tp_amb", "tpAmb"),
+    ("dps_dh_emi", "dhEmi"),
+    ("dps_ver_aplic", "verAplic"),
+    ("dps_serie", "serie"),
+    ("dps_n_dps", "nDPS"),
+    ("dps_d_compet", "dCompet"),
+    ("dps_tp_emit", "tpEmit"),
+    ("dps_c_loc_emi", "cLocEmi"),
+)
+
+_PREST_FIELDS = (
+    ("prest_cnpj", "CNPJ"),
+    ("prest_fone", "fone"),
+    ("prest_email", "email"),
+)
+
+_PREST_REG_TRIB_FIELDS = (
+    ("prest_op_simp_nac", "opSimpNac"),
+    ("prest_reg_esp_trib", "regEspTrib"),
+)
+
+_TOMA_FIELDS = (
+    ("toma_cnpj", "CNPJ"),
+    ("toma_x_nome", "xNome"),
+    ("toma_email", "email"),
+    ("toma_fone", "fone"),
+    ("toma_im", "IM"),
+)
+
+_TOMA_END_NAC_FIELDS = (
+    ("toma_c_mun", "cMun"),
+    ("toma_cep", "CEP"),
+)
+
+_TOMA_END_FIELDS = (
+    ("toma_x_lgr", "xLgr"),
+    ("toma_nro", "nro"),
+    ("toma_x_cpl", "xCpl"),
+    ("toma_x_bairro", "xBairro"),
+)
+
+_INTERM_FIELDS = (
+    ("interm_cnpj", "CNPJ"),
+    ("interm_cpf", "CPF"),
+    ("interm_nif", "NIF"),
+    ("interm_x_n_nif", "cNaoNIF"),
+    ("interm_caep", "CAEPF"),
+    ("interm_im", "IM"),
+    ("interm_nome", "xNome"),
+)
+
+_INTERM_END_NAC_FIELDS = (
+    ("interm_c_mun", "cMun"),
+    ("interm_cep", "CEP"),
+)
+
+_INTERM_END_EXT_FIELDS = (
+    ("interm_c_pais", "cPais"),
+    ("interm__end_post", "cEndPost"),
+    ("interm_x_cidade", "xCidade"),
+    ("interm_est_prov", "xEstProvReg"),
+)
+
+_INTERM_END_FIELDS = (
+    ("interm_x_lgr", "xLgr"),
+    ("interm_nro", "nro"),
+    ("interm_x_cpl", "xCpl"),
+    ("interm_x_bairro", "xBairro"),
+    ("interm_fone", "fone"),
+    ("interm_email", "email"),
+)
+
+_SERV_LOC_PREST_FIELDS = (
+    ("serv_c_loc_prestacao", "cLocPrestacao"),
+    ("serv_c_pais_prestacao", "cPaisPrestacao"),
+)
+
+_SERV_C_SERV_FIELDS = (
+    ("serv_c_trib_nac", "cTribNac"),
+    ("serv_c_trib_mun", "cTribMun"),
+    ("serv_x_desc_serv", "xDescServ"),
+)
+
+_SERV_INFO_COMPL_FIELDS = (
+    ("serv_x_inf_comp", "xInfComp"),
+)
+
+_V_SERV_PREST_FIELDS = (
+    ("dps_v_serv", "vServ"),
+)
+
+_V_DESC_COND_INCOND_FIELDS = (
+    ("trib_v_desc_incond", "vDescIcond"),
+    ("trib_v_desc_cond", "vDescCond"),
+)
+
+_TRIB_MUN_FIELDS = (
+    ("trib_trib_issqn", "tribISSQN"),
+    ("trib_tp_ret_issqn", "tpRetISSQN"),
+    ("trib_pais_result", "cPaisResult"),
+    ("trib_tp_imun", "tpImunidade"),
+    ("trib_p_aliq", "pAliq"),
+)
+
+_TRIB_MUN_BM_FIELDS = (
+    ("trib_v_bc_bm", "nBM"),
+    ("trib_red_bc_bm", "vRedBCBM"),
+)
+
+_TRIB_MUN_SUSP_FIELDS = (
+    ("trib_tp_susp", "tpSusp"),
+    ("trib_num_proc_susp", "nProcesso"),
+)
+
+_PISCOFINS_FIELDS = (
+    ("trib_cst", "CST"),
+    ("trib_v_bc_pis_cofins", "vBCPisCofins"),
+    ("trib_p_aliq_pis", "pAliqPis"),
+    ("trib_p_aliq_cofins", "pAliqCofins"),
+    ("trib_v_pis", "vPis"),
+    ("trib_v_cofins", "vCofins"),
+    ("trib_tp_ret_pis_cofins", "tpRetPisCofins"),
+)
+
+_TRIB_FED_FIELDS = (
+    ("trib_v_ret_irrf", "vRetIRRF"),
+    ("trib_v_ret_cp", "vRetCP"),
+    ("trib_v_ret_csll", "vRetCSLL"),
+)
+
+_V_TOT_TRIB_FIELDS = (
+    ("trib_v_tot_trib_fed", "vTotTribFed"),
+    ("trib_v_tot_trib_est", "vTotTribEst"),
+    ("trib_v_tot_trib_mun", "vTotTribMun"),
+)
+
+# Caminho (nomes locais a partir de infNFSe) do elemento de contexto de cada
+# grupo de campos. Todos os campos são atribuídos, com None quando ausentes no XML.
+_INF_DPS = ("infNFSe", "DPS", "infDPS")
+_TRIB = _INF_DPS + ("valores", "trib")
+
+_CAMPOS_XML = (
+    (("infNFSe",), _INF_NFSE_FIELDS),
+    (("infNFSe", "emit"), _EMIT_FIELDS),
+    (("infNFSe", "emit", "enderNac"), _EMIT_ENDER_FIELDS),
+    (("infNFSe", "valores"), _VALORES_FIELDS),
+    (_INF_DPS, _DPS_FIELDS),
+    (_INF_DPS + ("prest",), _PREST_FIELDS),
+    (_INF_DPS + ("prest", "regTrib"), _PREST_REG_TRIB_FIELDS),
+    (_INF_DPS + ("toma",), _TOMA_FIELDS),
+    (_INF_DPS + ("toma", "end", "endNac"), _TOMA_END_NAC_FIELDS),
+    (_INF_DPS + ("toma", "end"), _TOMA_END_FIELDS),
+    (_INF_DPS + ("interm",), _INTERM_FIELDS),
+    (_INF_DPS + ("interm", "end", "endNac"), _INTERM_END_NAC_FIELDS),
+    (_INF_DPS + ("interm", "end", "endExt"), _INTERM_END_EXT_FIELDS),
+    (_INF_DPS + ("interm", "end"), _INTERM_END_FIELDS),
+    (_INF_DPS + ("serv", "locPrest"), _SERV_LOC_PREST_FIELDS),
+    (_INF_DPS + ("serv", "cServ"), _SERV_C_SERV_FIELDS),
+    (_INF_DPS + ("serv", "infoCompl"), _SERV_INFO_COMPL_FIELDS),
+    (_INF_DPS + ("valores", "vServPrest"), _V_SERV_PREST_FIELDS),
+    (_INF_DPS + ("valores", "vDescCondIncond"), _V_DESC_COND_INCOND_FIELDS),
+    (_TRIB + ("tribMun",), _TRIB_MUN_FIELDS),
+    (_TRIB + ("tribMun", "BM"), _TRIB_MUN_BM_FIELDS),
+    (_TRIB + ("tribMun", "exigSusp"), _TRIB_MUN_SUSP_FIELDS),
+    (_TRIB + ("tribFed", "piscofins"), _PISCOFINS_FIELDS),
+    (_TRIB + ("tribFed",), _TRIB_FED_FIELDS),
+    (_TRIB + ("totTrib", "vTotTrib"), _V_TOT_TRIB_FIELDS),
+)
+
+# Caminho completo de cada tag -> atributo, usado para despachar os elementos
+# durante a leitura do XML
+_CAMPO_POR_CAMINHO = {
+    contexto + (tag,): nome
+    for contexto, fields in _CAMPOS_XML
+    for nome, tag in fields
+}
+
+
+def _eventos_da_arvore(root):
+    """
+    Gera os mesmos pares (evento, elemento) de iterparse com events=("start", "end")
+    percorrendo uma árvore já parseada. Comentários e instruções de
+    processamento, que não têm tag str, são ignorados como no iterparse.
+    """
+    yield "start", root
+    abertos = [root]
+    filhos = [iter(root)]
+    while filhos:
+        filho = next(filhos[-1], None)
+        if filho is None:
+            filhos.pop()
+            yield "end", abertos.pop()
+            continue
+        if not isinstance(filho.tag, str):
+            continue
+        yield "start", filho
+        abertos.append(filho)
+        filhos.append(iter(filho))
 
 
 class Nfse(xFPDF):
@@ -186,6 +582,77 @@ class Nfse(xFPDF):
         
         return None
 
+    @classmethod
+    def _extrair_campos(cls, xml):
+        """
+        Percorre o XML uma única vez (iterparse) e atribui cada elemento ao seu
+        campo pelo caminho de nomes locais a partir de infNFSe. Cada elemento é
+        limpo ao terminar, então a árvore completa nunca fica em memória. Uma
+        árvore já parseada passa pelo mesmo laço, com os eventos gerados por
+        _eventos_da_arvore e sem limpar nada, já que pertence ao chamador.
+        
+        Args:
+            xml: Conteúdo do XML da NFS-e (bytes ou str) ou elemento raiz já parseado
+        
+        Returns:
+            Tupla (id_inf_nfse, campos): o atributo Id de infNFSe (ou None) e o
+            dicionário {atributo: texto} com todos os campos de _CAMPOS_XML, None
+            quando ausentes no XML.
+        """
+        if isinstance(xml, (bytes, str)):
+            # Texto já decodificado é reescrito em UTF-8; a declaração de encoding
+            # do XML (ex.: ISO-8859-1) não vale mais para esses bytes
+            encoding = None
+            if isinstance(xml, str):
+                xml = xml.encode("utf-8")
+                encoding = "utf-8"
+            eventos = ET.iterparse(BytesIO(xml), events=("start", "end"), encoding=encoding)
+            limpar = True
+        else:
+            eventos = _eventos_da_arvore(xml)
+            limpar = False
+
+        ns = f"{{{cls.URL}}}"
+        ns_len = len(ns)
+
+        id_inf_nfse = None
+        encontrou_inf_nfse = False
+        campos = dict.fromkeys(_CAMPO_POR_CAMINHO.values())
+        # Caminhos ainda não encontrados; mantém a primeira ocorrência, como o find() fazia
+        pendentes = dict(_CAMPO_POR_CAMINHO)
+        # Pilha de caminhos a partir de infNFSe; None fora dele
+        caminhos = [None]
+        # Métodos ligados a nomes locais, fora do laço executado por elemento
+        empilhar = caminhos.append
+        desempilhar = caminhos.pop
+        encontrar_pendente = pendentes.pop
+
+        for evento, elem in eventos:
+            if evento == "start":
+                tag = elem.tag
+                if tag.startswith(ns):
+                    tag = tag[ns_len:]
+
+                caminho = caminhos[-1]
+                if caminho is not None:
+                    caminho = caminho + (tag,)
+                elif not encontrou_inf_nfse and tag == "infNFSe":
+                    encontrou_inf_nfse = True
+                    id_inf_nfse = elem.get("Id")
+                    caminho = (tag,)
+                empilhar(caminho)
+                continue
+
+            nome = encontrar_pendente(desempilhar(), None)
+            if nome is not None:
+                campos[nome] = elem.text or None
+
+            if limpar:
+                # Os filhos já foram processados; libera texto, atributos e subárvore
+                elem.clear()
+
+        return id_inf_nfse, campos
+
     def __init__(self, xml, config: NfseConfig = None):
         super().__init__(unit="mm", format="A4")
 
@@ -213,12 +680,15 @@ class Nfse(xFPDF):
 
         self.orientation = 'P'
 
-        root = ET.fromstring(xml)
+        # Última fonte definida por _set_font
+        self._fonte_atual = None
 
-        self.inf_nfse = root.find(f".//{{{self.URL}}}infNFSe")
+        # Percorre o XML uma única vez, extraindo todos os campos; ausentes ficam
+        # None, de modo que os métodos de desenho acessam os atributos diretamente
+        id_inf_nfse, campos = self._extrair_campos(xml)
         
         # Extrai a chave de acesso do atributo Id da tag infNFSe
-        self.chave_acesso = self.inf_nfse.get("Id") if self.inf_nfse is not None else None
+        self.chave_acesso = id_inf_nfse
         
         # Cria a URL completa do QR code
         if self.chave_acesso:
@@ -226,260 +696,12 @@ class Nfse(xFPDF):
         else:
             self.qr_code_url = None
 
-        # Método auxiliar para buscar tags com namespace
-        def find_tag(tag_name, parent=None):
-            if parent is None:
-                parent = self.inf_nfse
-            if parent is None:
-                return None
-            # Busca recursiva dentro do parent fornecido
-            return parent.find(f".//{{{self.URL}}}{tag_name}")
-
-        def find_tag_text(tag_name, parent=None):
-            elem = find_tag(tag_name, parent)
-            return elem.text if elem is not None and elem.text else None
-
-        # Captura das tags principais de infNFSe
-        self.x_loc_emi = find_tag_text("xLocEmi")
-        self.x_loc_prestacao = find_tag_text("xLocPrestacao")
-        self.n_nfse = find_tag_text("nNFSe")
-        self.c_loc_incid = find_tag_text("cLocIncid")
-        self.x_loc_incid = find_tag_text("xLocIncid")
-        self.x_trib_nac = find_tag_text("xTribNac")
-        self.ver_aplic = find_tag_text("verAplic")
-        self.amb_ger = find_tag_text("ambGer")
-        self.tp_emis = find_tag_text("tpEmis")
-        self.proc_emi = find_tag_text("procEmi")
-        self.c_stat = find_tag_text("cStat")
-        self.dh_proc = find_tag_text("dhProc")
-        self.n_dfse = find_tag_text("nDFSe")
-
-        # Captura dos dados do emitente
-        emit = find_tag("emit")
-        if emit is not None:
-            self.emit_cnpj = find_tag_text("CNPJ", emit)
-            self.emit_x_nome = find_tag_text("xNome", emit)
-            self.emit_fone = find_tag_text("fone", emit)
-            self.emit_email = find_tag_text("email", emit)
-            self.emit_im = find_tag_text("IM", emit)
-
-            # Endereço do emitente
-            ender_nac = find_tag("enderNac", emit)
-            if ender_nac is not None:
-                self.emit_x_lgr = find_tag_text("xLgr", ender_nac)
-                self.emit_nro = find_tag_text("nro", ender_nac)
-                self.emit_x_bairro = find_tag_text("xBairro", ender_nac)
-                self.emit_c_mun = find_tag_text("cMun", ender_nac)
-                self.emit_uf = find_tag_text("UF", ender_nac)
-                self.emit_cep = find_tag_text("CEP", ender_nac)
-
-        # Captura dos valores
-        valores = find_tag("valores")
-        if valores is not None:
-            self.v_bc = find_tag_text("vBC", valores)
-            self.p_aliq_aplic = find_tag_text("pAliqAplic", valores)
-            self.v_issqn = find_tag_text("vISSQN", valores)
-            self.v_total_ret = find_tag_text("vTotalRet", valores)
-            self.v_liq = find_tag_text("vLiq", valores)
-            self.v_calc_dr= find_tag_text("vCalcDR", valores)
-            self.v_bm = find_tag_text("vCalcBM", valores)
-
-
-        # Captura dos dados do DPS
-        dps = root.find(f".//{{{self.URL}}}DPS")
-        if dps is not None:
-            inf_dps = dps.find(f".//{{{self.URL}}}infDPS")
-
-            if inf_dps is not None:
-                self.dps_tp_amb = find_tag_text("tpAmb", inf_dps)
-                self.dps_dh_emi = find_tag_text("dhEmi", inf_dps)
-                self.dps_ver_aplic = find_tag_text("verAplic", inf_dps)
-                self.dps_serie = find_tag_text("serie", inf_dps)
-                self.dps_n_dps = find_tag_text("nDPS", inf_dps)
-                self.dps_d_compet = find_tag_text("dCompet", inf_dps)
-                self.dps_tp_emit = find_tag_text("tpEmit", inf_dps)
-                self.dps_c_loc_emi = find_tag_text("cLocEmi", inf_dps)
-
-                # Prestador
-                prest = find_tag("prest", inf_dps)
-                if prest is not None:
-                    self.prest_cnpj = find_tag_text("CNPJ", prest)
-                    self.prest_fone = find_tag_text("fone", prest)
-                    self.prest_email = find_tag_text("email", prest)
-
-                    reg_trib = find_tag("regTrib", prest)
-                    if reg_trib is not None:
-                        self.prest_op_simp_nac = find_tag_text(
-                            "opSimpNac", reg_trib)
-                        self.prest_reg_esp_trib = find_tag_text(
-                            "regEspTrib", reg_trib)
-
-                # Tomador
-                toma = find_tag("toma", inf_dps)
-                if toma is not None:
-                    self.toma_cnpj = find_tag_text("CNPJ", toma)
-                    self.toma_x_nome = find_tag_text("xNome", toma)
-                    self.toma_email = find_tag_text("email", toma)
-                    self.toma_fone = find_tag_text("fone", toma)
-                    self.toma_im = find_tag_text("IM", toma)
-
-                    end = find_tag("end", toma)
-                    if end is not None:
-                        end_nac = find_tag("endNac", end)
-                        if end_nac is not None:
-                            self.toma_c_mun = find_tag_text("cMun", end_nac)
-                            self.toma_cep = find_tag_text("CEP", end_nac)
-                        self.toma_x_lgr = find_tag_text("xLgr", end)
-                        self.toma_nro = find_tag_text("nro", end)
-                        self.toma_x_cpl = find_tag_text("xCpl", end)
-                        self.toma_x_bairro = find_tag_text("xBairro", end)
-
-                # Intermediario
-                interm = find_tag("interm", inf_dps)
-                if interm is not None:
-                    self.interm_cnpj = find_tag_text("CNPJ", interm)
-                    self.interm_cpf = find_tag_text("CPF", interm)
-                    self.interm_nif = find_tag_text("NIF", interm)
-                    self.interm_x_n_nif = find_tag_text("cNaoNIF", interm)
-                    self.interm_caep = find_tag_text("CAEPF", interm)
-                    self.interm_im = find_tag_text("IM", interm)
-                    self.interm_nome = find_tag_text("xNome", interm)
-
-                    end = find_tag("end", interm)
-
-                    if end is not None:
-                        end_nac = find_tag("endNac", end)
-
-                        if end_nac is not None:
-                            self.interm_c_mun = find_tag_text("cMun", end_nac)
-                            self.interm_cep = find_tag_text("CEP", end_nac)
-                        
-                        end_ext = find_tag("endExt", end)
-                        if end_ext is not None:
-                            self.interm_c_pais = find_tag_text("cPais", end_ext)
-                            self.interm__end_post = find_tag_text("cEndPost", end_ext)
-                            self.interm_x_cidade = find_tag_text("xCidade", end_ext)
-                            self.interm_est_prov = find_tag_text("xEstProvReg", end_ext)
-
-                        self.interm_x_lgr = find_tag_text("xLgr", end)
-                        self.interm_nro = find_tag_text("nro", end)
-                        self.interm_x_cpl = find_tag_text("xCpl", end)
-                        self.interm_x_bairro = find_tag_text("xBairro", end)
-
-                        self.interm_fone = find_tag_text("fone", end)
-                        self.interm_email = find_tag_text("email", end)
-
-                    end = find_tag("end", interm)
-                    if end is not None:
-                        end_nac = find_tag("endNac", end)
-
-                # Serviço
-                serv = find_tag("serv", inf_dps)
-                if serv is not None:
-                    loc_prest = find_tag("locPrest", serv)
-                    if loc_prest is not None:
-                        self.serv_c_loc_prestacao = find_tag_text(
-                            "cLocPrestacao", loc_prest)
-
-                        self.serv_c_pais_prestacao = find_tag_text(
-                            "cPaisPrestacao", loc_prest)
-
-                    c_serv = find_tag("cServ", serv)
-                    if c_serv is not None:
-                        self.serv_c_trib_nac = find_tag_text(
-                            "cTribNac", c_serv)
-
-                        self.serv_c_trib_mun = find_tag_text(
-                            "cTribMun", c_serv)
-
-                        self.serv_x_desc_serv = find_tag_text(
-                            "xDescServ", c_serv)
-
-                    info_compl = find_tag("infoCompl", serv)
-                    if info_compl is not None:
-                        self.serv_x_inf_comp = find_tag_text(
-                            "xInfComp", info_compl)
-
-                # Valores do DPS
-                valores_dps = find_tag("valores", inf_dps)
-                if valores_dps is not None:
-                    v_serv_prest = find_tag("vServPrest", valores_dps)
-                    if v_serv_prest is not None:
-                        self.dps_v_serv = find_tag_text("vServ", v_serv_prest)
-
-                    v_desc_inc = find_tag('vDescCondIncond', valores_dps)
-                    if v_desc_inc is not None:
-                        self.trib_v_desc_incond = find_tag_text("vDescIcond", v_desc_inc)
-                        self.trib_v_desc_cond = find_tag_text("vDescCond", v_desc_inc)
-
-                    # Tributos
-                    trib = find_tag("trib", valores_dps)
-                    if trib is not None:
-                        # Tributos Municipais
-                        trib_mun = find_tag("tribMun", trib)
-                        if trib_mun is not None:
-                            self.trib_trib_issqn = find_tag_text(
-                                "tribISSQN", trib_mun)
-                            self.trib_tp_ret_issqn = find_tag_text(
-                                "tpRetISSQN", trib_mun)
-
-                            self.trib_pais_result = find_tag_text(
-                                "cPaisResult", trib_mun)
-
-                            self.trib_tp_imun = find_tag_text(
-                                "tpImunidade", trib_mun)
-
-                            self.trib_p_aliq = find_tag_text("pAliq", trib_mun)
-
-                            bm = find_tag("BM", trib_mun)
-                            if bm is not None:
-                                self.trib_v_bc_bm = find_tag_text(
-                                    "nBM", bm)
-                                self.trib_red_bc_bm = find_tag_text("vRedBCBM", bm)
-
-                            susp = find_tag("exigSusp", trib_mun)
-                            if susp is not None:
-                                self.trib_tp_susp = find_tag_text("tpSusp", susp)
-                                self.trib_num_proc_susp = find_tag_text("nProcesso", susp)
-
-                        # Tributos Federais
-                        trib_fed = find_tag("tribFed", trib)
-                        if trib_fed is not None:
-                            piscofins = find_tag("piscofins", trib_fed)
-                            if piscofins is not None:
-                                self.trib_cst = find_tag_text("CST", piscofins)
-                                self.trib_v_bc_pis_cofins = find_tag_text(
-                                    "vBCPisCofins", piscofins)
-                                self.trib_p_aliq_pis = find_tag_text(
-                                    "pAliqPis", piscofins)
-                                self.trib_p_aliq_cofins = find_tag_text(
-                                    "pAliqCofins", piscofins)
-                                self.trib_v_pis = find_tag_text(
-                                    "vPis", piscofins)
-                                self.trib_v_cofins = find_tag_text(
-                                    "vCofins", piscofins)
-                                self.trib_tp_ret_pis_cofins = find_tag_text(
-                                    "tpRetPisCofins", piscofins)
-
-                            self.trib_v_ret_irrf = find_tag_text(
-                                "vRetIRRF", trib_fed)
-
-                            self.trib_v_ret_cp = find_tag_text(
-                                "vRetCP", trib_fed)
-                            self.trib_v_ret_csll = find_tag_text(
-                                "vRetCSLL", trib_fed)
-
-                        # Total de Tributos
-                        tot_trib = find_tag("totTrib", trib)
-                        if tot_trib is not None:
-                            v_tot_trib = find_tag("vTotTrib", tot_trib)
-                            if v_tot_trib is not None:
-                                self.trib_v_tot_trib_fed = find_tag_text(
-                                    "vTotTribFed", v_tot_trib)
-                                self.trib_v_tot_trib_est = find_tag_text(
-                                    "vTotTribEst", v_tot_trib)
-                                self.trib_v_tot_trib_mun = find_tag_text(
-                                    "vTotTribMun", v_tot_trib)
+        # Atribui todos os campos de uma vez, em vez de um atributo por vez
+        self.__dict__.update(campos)
+
+        self._prefetch_municipios()
+
+        self._prepare_formatted_fields()
 
         self.add_page(orientation=self.orientation)
 
@@ -492,63 +714,141 @@ class Nfse(xFPDF):
             exclude_sections=self._exclude_sections()
         )
 
+        # Limite direito da área útil; as margens não mudam depois daqui e o epw
+        # do fpdf é uma property recalculada a cada acesso
+        self._x_direita = self.l_margin + self.epw
+
         self._draw_borders()
 
         self._draw_header()
 
-        self._draw_horizontal_line("info_nota")
-
         self._draw_info_note()
 
-        self._draw_horizontal_line("emitente")
-
         self._draw_emitente()
 
-        self._draw_horizontal_line("tomador")
-
         self._draw_tomador()
 
-        self._draw_horizontal_line("intermediario")
-
         self._draw_intermediario()
 
-        self._draw_horizontal_line("servico")
-
         self._draw_servico()
 
-        self._draw_horizontal_line("tb_municipal")
-
         self._draw_trib_municipal()
 
-        self._draw_horizontal_line('trib_federal')
-
         self._draw_trib_federal()
 
-        self._draw_horizontal_line("valor_nfse")
-
         self._draw_valor_nfse()
 
-        self._draw_horizontal_line("totais")
-
         self._draw_totais()
 
-        self._draw_horizontal_line("info_complementar")
-
         self._draw_info_complementar()
 
+        # As seções ajustam as posições das seguintes durante o desenho, então as
+        # linhas divisórias são desenhadas por último, já nas posições finais
+        self._draw_horizontal_lines(_LINHAS_SECOES)
+
         # Não salva automaticamente - deve ser chamado explicitamente via output_pdf()
         # self.output_pdf("nfse.pdf")
 
 
+    def _prefetch_municipios(self):
+        """
+        Resolve antes do desenho todos os municípios usados no PDF.
+        As consultas ao IBGE são I/O de rede, então quando há mais de um código
+        elas são feitas em paralelo, custando ~1 RTT em vez de um por seção.
+        """
+        codigos = list(dict.fromkeys(
+            cod for cod in (
+                self.emit_c_mun,
+                self.toma_c_mun,
+                self.interm_c_mun,
+                self.serv_c_loc_prestacao,
+                self.trib_v_bc_bm,
+            ) if cod
+        ))
+
+        if len(codigos) > 1:
+            with ThreadPoolExecutor(max_workers=len(codigos)) as executor:
+                resultados = list(executor.map(buscar_municipio, codigos))
+        else:
+            resultados = [buscar_municipio(cod) for cod in codigos]
+
+        self._municipios = dict(zip(codigos, resultados))
+
+    def _prepare_formatted_fields(self):
+        """
+        Formata uma única vez os documentos, telefones, CEPs e valores exibidos no PDF.
+        Alguns valores aparecem em mais de uma seção, e assim os métodos de desenho
+        apenas escrevem os textos já prontos.
+        """
+        # Valores usados em cálculos, convertidos para float uma única vez
+        self._p_aliq_aplic = valor_numerico(self.p_aliq_aplic)
+        self._v_bc = valor_numerico(self.v_bc)
+        self._v_ret_cp = valor_numerico(self.trib_v_ret_cp)
+        self._v_ret_irrf = valor_numerico(self.trib_v_ret_irrf)
+        self._v_ret_csll = valor_numerico(self.trib_v_ret_csll)
+        self._v_pis = valor_numerico(self.trib_v_pis)
+        self._v_cofins = valor_numerico(self.trib_v_cofins)
+
+        self._fmt_emit_cnpj = formatar_cnpj_cpf_nif(self.emit_cnpj) if self.emit_cnpj else "-"
+        self._fmt_emit_fone = formatar_telefone(self.emit_fone) if self.emit_fone else ""
+        self._fmt_emit_cep = formatar_cep(self.emit_cep) if self.emit_cep else ""
+
+        toma_cnpj = self.toma_cnpj
+        toma_fone = self.toma_fone
+        toma_cep = self.toma_cep
+        self._fmt_toma_cnpj = formatar_cnpj_cpf_nif(toma_cnpj) if toma_cnpj else "-"
+        self._fmt_toma_fone = formatar_telefone(toma_fone) if toma_fone else ""
+        self._fmt_toma_cep = formatar_cep(toma_cep) if toma_cep else ""
+
+        # Primeiro documento não nulo do intermediário
+        doc = '-'
+        for item in (self.interm_cnpj, self.interm_cpf, self.interm_nif):
+            if item is not None:
+                doc = item
+                break
+        self._fmt_interm_doc = formatar_cnpj_cpf_nif(doc)
+        self._fmt_interm_fone = formatar_telefone(self.interm_fone or '-')
+        self._fmt_interm_cep = formatar_cep(self.interm_cep or '-')
+
+        # Regime especial de tributação, exibido no emitente e na tributação municipal
+        self._fmt_reg_esp_trib = REG_ESP_TRIB.get(self.prest_reg_esp_trib, '-')
+
+        self._fmt_benef_mun = "-"  # trib_benef_mun não é extraído do XML
+        self._fmt_v_serv = formatar_moeda(self.dps_v_serv or '-')
+        self._fmt_desc_cond = formatar_moeda(self.trib_v_desc_cond or '-')
+        self._fmt_desc_incond = formatar_moeda(self.trib_v_desc_incond or '-')
+        self._fmt_red_deduc = formatar_moeda(self.v_calc_dr or '-')
+        self._fmt_bm = formatar_moeda(self.v_bm or '-')
+        self._fmt_bc_issqn = formatar_moeda(self.v_bc or '-')
+        self._fmt_ret_issqn = formatar_moeda(self.v_total_ret or 'Não Retido')
+        self._fmt_issqn_ret = formatar_moeda(self.v_total_ret or '-')
+        self._fmt_v_liq = formatar_moeda(self.v_liq or '-')
+
+        self._fmt_aliq = (self.p_aliq_aplic or '0.00') + '%'
+        self._fmt_vl_apr = formatar_moeda(round((self._p_aliq_aplic * self._v_bc) / 100, 2))
+
+        self._fmt_irrf = formatar_moeda(self.trib_v_ret_irrf or '-')
+        self._fmt_cp = formatar_moeda(self.trib_v_ret_cp or '-')
+        self._fmt_csll = formatar_moeda(self.trib_v_ret_csll or '-')
+        self._fmt_pis = formatar_moeda(self.trib_v_pis or '-')
+        self._fmt_cofins = formatar_moeda(self.trib_v_cofins or '-')
+
+        self._fmt_v_ret_total = formatar_moeda(self._v_ret_cp + self._v_ret_irrf + self._v_ret_csll)
+        self._fmt_v_pis_cofins_total = formatar_moeda(self._v_pis + self._v_cofins)
+
+        self._fmt_tot_trib_fed = formatar_moeda(self.trib_v_tot_trib_fed or '-')
+        self._fmt_tot_trib_est = formatar_moeda(self.trib_v_tot_trib_est or '-')
+        self._fmt_tot_trib_mun = formatar_moeda(self.trib_v_tot_trib_mun or '-')
+
     def _exclude_sections(self):
         '''
         Verifica entre as seções de Tomador e Intermediário se existe seção opcional.
         '''
         list = []
-        if getattr(self, 'interm_cnpj', None) is None:
+        if self.interm_cnpj is None:
             list.append("intermediario")
 
-        if getattr(self, 'toma_cnpj', None) is None:
+        if self.toma_cnpj is None:
             list.append("tomador")
         
         return list
@@ -600,7 +900,6 @@ class Nfse(xFPDF):
         logo_path = self.logo_image
         if not logo_path:
             # Tenta usar o logo padrão se não estiver configurado
-            import os
             default_logo = os.path.join("pdf", "assets", "Logo-Nfse.png")
             if os.path.exists(default_logo):
                 logo_path = default_logo
@@ -616,34 +915,30 @@ class Nfse(xFPDF):
                 )
             except Exception as e:
                 # Se não conseguir carregar a imagem, apenas deixa o espaço
-                # Em produção, pode ser útil logar o erro
-                print(f"Erro ao carregar logo: {e}")
-                pass
+                logger.warning("Erro ao carregar logo: %s", e)
 
         # Obtém os elementos de texto do layout
         text1_element = self.layout.get_header_text1()
         text2_element = self.layout.get_header_text2()
 
         # Desenha o primeiro texto ("DANFSe v1.0")
-        self.set_font(self.default_font, text1_element.font_style,
-                      text1_element.font_size)
+        self._set_font(text1_element.font_style, text1_element.font_size)
         self.set_xy(text1_element.x, text1_element.y)
         self.cell(
             w=text1_element.width,
             h=text1_element.height,
-            txt=text1_element.value,
+            text=text1_element.value,
             border=0,
             align="C"
         )
 
         # Desenha o segundo texto ("Documento Auxiliar da NFS-e")
-        self.set_font(self.default_font, text2_element.font_style,
-                      text2_element.font_size)
+        self._set_font(text2_element.font_style, text2_element.font_size)
         self.set_xy(text2_element.x, text2_element.y)
         self.cell(
             w=text2_element.width,
             h=text2_element.height,
-            txt=text2_element.value,
+            text=text2_element.value,
             border=0,
             align="C"
         )
@@ -651,8 +946,7 @@ class Nfse(xFPDF):
         # Desenha o texto da prefeitura (lado direito)
         if self.x_loc_emi:
             prefeitura_element = self.layout.get_header_prefeitura(self.x_loc_emi)
-            self.set_font(self.default_font, prefeitura_element.font_style,
-                          prefeitura_element.font_size)
+            self._set_font(prefeitura_element.font_style, prefeitura_element.font_size)
             
             # Calcula a largura máxima disponível (da posição X até a margem direita)
             # Margem direita = margem esquerda + largura efetiva
@@ -667,28 +961,38 @@ class Nfse(xFPDF):
                 self.multi_cell(
                     w=max_width,
                     h=prefeitura_element.height,
-                    txt=prefeitura_element.value,
+                    text=prefeitura_element.value,
                     border=0,
                     align="R"  # Alinhado à direita
                 )
 
-    def _draw_horizontal_line(self, line_name: str):
+    def _draw_horizontal_lines(self, line_names):
         """
-        Desenha uma linha horizontal baseada no nome da linha.
+        Desenha as linhas horizontais das seções em um único caminho do PDF:
+        um par moveto/lineto por linha e um só operador de traço (S) no final.
 
         Args:
-            line_name: Nome da linha (ex: "totais", "valor_nfse", "info_nota", etc.)
+            line_names: Nomes das linhas (ex: "totais", "valor_nfse", "info_nota", etc.)
         """
-        try:
-            # Obtém o elemento de linha do layout
-            line_element = self.layout.get_horizontal_line(line_name)
+        k = self.k
+        h = self.h
+        segmentos = []
+        for line_name in line_names:
+            try:
+                # Obtém o elemento de linha do layout
+                line_element = self.layout.get_horizontal_line(line_name)
+            except ValueError as e:
+                logger.warning("Aviso: %s", e)
+                continue
+
+            # Mesmo formato de FPDF.line(x1, y1, x2, y2), com y invertido na página
+            segmentos.append(
+                f"{line_element.x * k:.2f} {(h - line_element.y) * k:.2f} m "
+                f"{line_element.x2 * k:.2f} {(h - line_element.y2) * k:.2f} l"
+            )
 
-            # Desenha a linha horizontal
-            # FPDF usa: line(x1, y1, x2, y2)
-            self.line(line_element.x, line_element.y,
-                      line_element.x2, line_element.y2)
-        except ValueError as e:
-            print(f"Aviso: {e}")
+        if segmentos:
+            self._out(" ".join(segmentos) + " S")
 
     def _draw_info_note(self):
         """
@@ -698,80 +1002,41 @@ class Nfse(xFPDF):
         qr_element = self.layout.get_info_note_qr_code()
         if qr_element.width and qr_element.height and self.qr_code_url:
             try:
-                target_size_px = int(qr_element.width * 3.779527559)
-                box_size = max(3, int(target_size_px / 25))
-                x_offset = qr_element.x - self.l_margin
-                y_offset = qr_element.y - self.t_margin
-                
-                qr_code_instance = Qrcode(
-                    qr_code_data=self.qr_code_url,
-                    y_margin_ret=self.l_margin,
-                    x_offset=x_offset,
-                    y_offset=y_offset,
-                    box_size=box_size,
-                    border=1
-                )
-                
-                import qrcode
-                qr = qrcode.QRCode(
-                    version=1,
-                    error_correction=qrcode.constants.ERROR_CORRECT_M,
-                    box_size=qr_code_instance.box_size,
-                    border=qr_code_instance.border,
-                )
-                qr.add_data(qr_code_instance.qr_code_data)
-                qr.make(fit=True)
-                qr_img = qr.make_image(fill_color="black", back_color="white")
-                
-                from PIL import Image
-                target_width_px = int(qr_element.width * 3.779527559)
-                target_height_px = int(qr_element.height * 3.779527559)
-                qr_img_resized = qr_img.resize((target_width_px, target_height_px), Image.Resampling.LANCZOS)
-                
-                num_x = qr_code_instance.y_margin_ret + qr_code_instance.x_offset
-                num_y = self.t_margin + qr_code_instance.y_offset
-                
-                self.image(
-                    name=qr_img_resized,
-                    x=num_x,
-                    y=num_y,
-                    w=qr_element.width,
-                    h=qr_element.height
+                # Vetorial: os módulos vão direto para o conteúdo da página, sem imagem
+                desenhar_qr_code(
+                    self,
+                    self.qr_code_url,
+                    x=qr_element.x,
+                    y=qr_element.y,
+                    largura=qr_element.width,
+                    altura=qr_element.height,
+                    border=1,
                 )
-                
             except Exception as e:
-                print(f"Erro ao gerar QR code: {e}")
-                import traceback
-                traceback.print_exc()
+                # O traceback só é montado quando o nível DEBUG está ativo
+                logger.warning("Erro ao gerar QR code: %s", e,
+                               exc_info=logger.isEnabledFor(logging.DEBUG))
 
-    
-        self._draw_cell(self.layout.get_info_note_chave_label(), "Chave de Acesso da NFS-e")
-        self._draw_cell(self.layout.get_info_note_chave_value(value=self.chave_acesso))
-
-        self._draw_cell(self.layout.get_info_note_numero_label(), "Número da NFS-e")
-        self._draw_cell(self.layout.get_info_note_numero_value(value=self.n_nfse))
 
         comp_data = self.parse_datetime(self.dps_d_compet)
         comp_format = comp_data.strftime("%d/%m/%Y") if comp_data else "-"
-        self._draw_cell(self.layout.get_info_note_competencia_label(), "Competência da NFS-e")
-        self._draw_cell(self.layout.get_info_note_competencia_value(value=comp_format))
 
         data_emiss = self.parse_datetime(self.dh_proc)
         data_emiss_format = data_emiss.strftime("%d/%m/%Y %H:%M:%S") if data_emiss else ""
-        self._draw_cell(self.layout.get_info_note_data_label(), "Data e Hora da emissão da NFS-e")
-        self._draw_cell(self.layout.get_info_note_data_value(value=data_emiss_format))
-
-
-        self._draw_cell(self.layout.get_info_note_number_dps_label(), "Número da DPS")
-        self._draw_cell(self.layout.get_info_note_number_dps_value(value=self.dps_n_dps))
-
-        self._draw_cell(self.layout.get_info_note_serie_dps_label(), "Série da DPS")
-        self._draw_cell(self.layout.get_info_note_serie_dps_value(value=self.dps_serie))
 
         data_dps = self.parse_datetime(self.dps_dh_emi)
         data_dps_format = data_dps.strftime("%d/%m/%Y %H:%M:%S") if data_dps else "-"
-        self._draw_cell(self.layout.get_info_note_date_dps_label(), "Data e Hora da emissão da DPS")
-        self._draw_cell(self.layout.get_info_note_date_dps_value(value=data_dps_format))
+
+        layout = self.layout
+        self._draw_pairs((
+            (layout.get_info_note_chave_label(), layout.get_info_note_chave_value(value=self.chave_acesso)),
+            (layout.get_info_note_numero_label(), layout.get_info_note_numero_value(value=self.n_nfse)),
+            (layout.get_info_note_competencia_label(), layout.get_info_note_competencia_value(value=comp_format)),
+            (layout.get_info_note_data_label(), layout.get_info_note_data_value(value=data_emiss_format)),
+            (layout.get_info_note_number_dps_label(), layout.get_info_note_number_dps_value(value=self.dps_n_dps)),
+            (layout.get_info_note_serie_dps_label(), layout.get_info_note_serie_dps_value(value=self.dps_serie)),
+            (layout.get_info_note_date_dps_label(), layout.get_info_note_date_dps_value(value=data_dps_format)),
+        ))
 
         # Texto de autenticidade do QR code
         qr_label_element = self.layout.get_info_note_qr_label()
@@ -782,57 +1047,30 @@ class Nfse(xFPDF):
         """
         Desenha a seção Emitente com os dados do emitente.
         """
-        self._draw_cell(self.layout.get_emitente_title(), "EMITENTE DA NFS-e")
-
-        self._draw_cell(self.layout.get_emitente_subtitle(), "Prestador do Serviço")
-
-        self._draw_cell(self.layout.get_emitente_cnpj_label(), "CNPJ / CPF / NIF")
-        self._draw_cell(self.layout.get_emitente_cnpj_value(value=formatar_cnpj_cpf_nif(self.emit_cnpj) if self.emit_cnpj else "-"))
-
-        self._draw_cell(self.layout.get_emitente_insc_municipal_label(), "Inscrição Municipal")
-        self._draw_cell(self.layout.get_emitente_insc_municipal_value(value=self.emit_im if self.emit_im else ""))
-
-        self._draw_cell(self.layout.get_emitente_telefone_label(), "Telefone")
-        self._draw_cell(self.layout.get_emitente_telefone_value(value=formatar_telefone(self.emit_fone) if self.emit_fone else ""))
-
-        self._draw_cell(self.layout.get_emitente_nome_label(), "Nome / Nome Empresarial")
-        self._draw_cell(self.layout.get_emitente_nome_value(value=self.emit_x_nome if self.emit_x_nome else ""))
+        layout = self.layout
+        self._draw_cell(layout.get_emitente_title())
 
-        self._draw_cell(self.layout.get_emitente_email_label(), "Email")
-        self._draw_cell(self.layout.get_emitente_email_value(value=self.emit_email if self.emit_email else ""))
+        self._draw_cell(layout.get_emitente_subtitle())
 
         endereco = f"{self.emit_x_lgr}, {self.emit_nro} {self.emit_x_bairro}"
-        self._draw_cell(self.layout.get_emitente_endereco_label(), "Endereço")
-        self._draw_cell(self.layout.get_emitente_endereco_value(value=endereco if endereco else ""))
-
-        import requests
-        cod_mun = self.emit_c_mun if self.emit_c_mun else ""
-        response = requests.get(f"https://servicodados.ibge.gov.br/api/v1/localidades/municipios/{cod_mun}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            municipio = data["nome"]
-        else:
-            municipio = ""
 
+        municipio, _ = self._municipios.get(self.emit_c_mun, ("", ""))
         municipio_uf = f"{municipio} - {self.emit_uf}"
-        self._draw_cell(self.layout.get_emitente_municipio_label(), "Município")
-        self._draw_cell(self.layout.get_emitente_municipio_value(municipio_uf), "Florianópolis - SC")
-
-
-        self._draw_cell(self.layout.get_emitente_cep_label(), "CEP")
-        self._draw_cell(self.layout.get_emitente_cep_value(value=formatar_cep(self.emit_cep) if self.emit_cep else ""))
 
-
-        op_simp_nac = self.prest_op_simp_nac if self.prest_op_simp_nac else ""
-        op_simp_nac_desc = de_para_op_simp_nac(op_simp_nac)
-        self._draw_cell(self.layout.get_emitente_sn_label(), "Simples Nacional na Data de Competência")
-        self._draw_cell(self.layout.get_emitente_sn_value(value=op_simp_nac_desc))
-
-        regime = self.prest_reg_esp_trib if self.prest_reg_esp_trib else ""
-        regime_desc = de_para_reg_esp_trib(regime)
-        self._draw_cell(self.layout.get_emitente_sn_apuracao_label(), "Regime de Apuração Tributária pelo SN")
-        self._draw_cell(self.layout.get_emitente_sn_apuracao_value(value=regime_desc))
+        op_simp_nac_desc = OP_SIMP_NAC.get(self.prest_op_simp_nac, '-')
+
+        self._draw_pairs((
+            (layout.get_emitente_cnpj_label(), layout.get_emitente_cnpj_value(value=self._fmt_emit_cnpj)),
+            (layout.get_emitente_insc_municipal_label(), layout.get_emitente_insc_municipal_value(value=self.emit_im if self.emit_im else "")),
+            (layout.get_emitente_telefone_label(), layout.get_emitente_telefone_value(value=self._fmt_emit_fone)),
+            (layout.get_emitente_nome_label(), layout.get_emitente_nome_value(value=self.emit_x_nome if self.emit_x_nome else "")),
+            (layout.get_emitente_email_label(), layout.get_emitente_email_value(value=self.emit_email if self.emit_email else "")),
+            (layout.get_emitente_endereco_label(), layout.get_emitente_endereco_value(value=endereco if endereco else "")),
+            (layout.get_emitente_municipio_label(), layout.get_emitente_municipio_value(municipio_uf)),
+            (layout.get_emitente_cep_label(), layout.get_emitente_cep_value(value=self._fmt_emit_cep)),
+            (layout.get_emitente_sn_label(), layout.get_emitente_sn_value(value=op_simp_nac_desc)),
+            (layout.get_emitente_sn_apuracao_label(), layout.get_emitente_sn_apuracao_value(value=self._fmt_reg_esp_trib)),
+        ))
 
     def _draw_tomador(self):
         """
@@ -840,24 +1078,24 @@ class Nfse(xFPDF):
         """
 
         if 'tomador' in self._exclude_sections():
-            self._draw_cell(self.layout.dados_tomador_null(), "TOMADOR DO SERVIÇO NÃO IDENTIFICADO NA NFS-e")
+            self._draw_cell(self.layout.dados_tomador_null())
             return
 
-        self._draw_cell(self.layout.get_tomador_title(), "TOMADOR DO SERVIÇO")
+        self._draw_cell(self.layout.get_tomador_title())
 
-        self._draw_cell(self.layout.get_tomador_cnpj_label(), "CNPJ / CPF / NIF")
-        self._draw_cell(self.layout.get_tomador_cnpj_value(value=formatar_cnpj_cpf_nif(self.toma_cnpj) if self.toma_cnpj else "-"))
+        self._draw_cell(self.layout.get_tomador_cnpj_label())
+        self._draw_cell(self.layout.get_tomador_cnpj_value(value=self._fmt_toma_cnpj))
 
-        self._draw_cell(self.layout.get_tomador_im_label(), "Inscrição Municipal")
-        self._draw_cell(self.layout.get_tomador_im_value(self.toma_im if self.toma_im else ""), "1234567890")
+        self._draw_cell(self.layout.get_tomador_im_label())
+        self._draw_cell(self.layout.get_tomador_im_value(self.toma_im if self.toma_im else ""))
 
-        self._draw_cell(self.layout.get_tomador_telefone_label(), "Telefone")
-        self._draw_cell(self.layout.get_tomador_telefone_value(value=formatar_telefone(self.toma_fone) if self.toma_fone else ""))
+        self._draw_cell(self.layout.get_tomador_telefone_label())
+        self._draw_cell(self.layout.get_tomador_telefone_value(value=self._fmt_toma_fone))
 
-        self._draw_cell(self.layout.get_tomador_nome_label(), "Nome / Nome Empresarial")
-        self._draw_multi_cell( self.layout.get_tomador_nome_value(value=self.toma_x_nome if self.toma_x_nome else ""))
+        self._draw_cell(self.layout.get_tomador_nome_label())
+        self._draw_multi_cell(self.layout.get_tomador_nome_value(value=self.toma_x_nome if self.toma_x_nome else ""))
 
-        self._draw_cell(self.layout.get_tomador_email_label(), "Email")
+        self._draw_cell(self.layout.get_tomador_email_label())
         self._draw_multi_cell(self.layout.get_tomador_email_value(value=self.toma_email if self.toma_email else ""))
 
         try:
@@ -865,12 +1103,11 @@ class Nfse(xFPDF):
         except Exception as e:
             endereco = ""
         
-        import textwrap
-        endereco_linhas = textwrap.wrap(endereco, width=75, break_long_words=False) if endereco and len(endereco) > 75 else ([endereco] if endereco else [])
+        endereco_linhas = _WRAP_75.wrap(endereco) if endereco and len(endereco) > 75 else ([endereco] if endereco else [])
         len_endereco_linhas = len(endereco_linhas)
         
         endereco_element = self.layout.get_tomador_endereco_value()
-        line_height = endereco_element.line_height if endereco_element.line_height is not None else endereco_element.height
+        line_height = endereco_element.line_height
 
         if len_endereco_linhas > 1:
             add_height = (len_endereco_linhas - 1) * line_height
@@ -882,27 +1119,17 @@ class Nfse(xFPDF):
         })
 
         endereco_formatado = "\n".join(endereco_linhas) if endereco_linhas else ""
-        self._draw_cell(self.layout.get_tomador_endereco_label(), "Endereço")
+        self._draw_cell(self.layout.get_tomador_endereco_label())
         self._draw_multi_cell(self.layout.get_tomador_endereco_value(value=endereco_formatado))
 
-        import requests
-        cod_mun = self.toma_c_mun if self.toma_c_mun else ""
-        response = requests.get(f"https://servicodados.ibge.gov.br/api/v1/localidades/municipios/{cod_mun}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            municipio = data["nome"]
-            uf = data['microrregiao']['mesorregiao']['UF']['sigla']
-        else:
-            municipio = ""
-            uf = ""
+        municipio, uf = self._municipios.get(self.toma_c_mun, ("", ""))
 
         municipio_uf = f"{municipio} - {uf}"
-        self._draw_cell(self.layout.get_tomador_municipio_label(), "Município")
+        self._draw_cell(self.layout.get_tomador_municipio_label())
         self._draw_cell(self.layout.get_tomador_municipio_value(value=municipio_uf if municipio_uf else ""))
 
-        self._draw_cell(self.layout.get_tomador_cep_label(), "CEP")
-        self._draw_cell(self.layout.get_tomador_cep_value(value=formatar_cep(self.toma_cep) if self.toma_cep else ""))
+        self._draw_cell(self.layout.get_tomador_cep_label())
+        self._draw_cell(self.layout.get_tomador_cep_value(value=self._fmt_toma_cep))
 
     def _draw_intermediario(self):
         """
@@ -915,54 +1142,36 @@ class Nfse(xFPDF):
 
         self._draw_cell(self.layout.get_intermediario_title())
 
-        doc = '-'
-
-        cnpj = getattr(self, 'interm_cnpj', None)
-        cpf = getattr(self, 'interm_cpf', None)
-        nif = getattr(self, 'interm_nif', None)
-
-        # Verificar o primeiro campo não nulo
-        list = [cnpj, cpf, nif]
-        for item in list:
-            if item is not None:
-                doc = item
-                break
-
-        doc = formatar_cnpj_cpf_nif(doc)
-
         self._draw_cell(self.layout.get_intermediario_cnpj_label())
-        self._draw_cell(self.layout.get_intermediario_cnpj_value(value=doc))
+        self._draw_cell(self.layout.get_intermediario_cnpj_value(value=self._fmt_interm_doc))
 
-        im = getattr(self, 'interm_im', '-')
+        im = self.interm_im or '-'
         self._draw_cell(self.layout.get_intermediario_insc_mun_label())
         self._draw_cell(self.layout.get_intermediario_insc_mun_value(value=im))
 
-        fone = getattr(self, 'interm_fone', '-')
         self._draw_cell(self.layout.get_intermediario_telefone_label())
-        self._draw_cell(self.layout.get_intermediario_telefone_value(value=formatar_telefone(fone)))
+        self._draw_cell(self.layout.get_intermediario_telefone_value(value=self._fmt_interm_fone))
 
-        nome = getattr(self, 'interm_nome', '-')
+        nome = self.interm_nome or '-'
         self._draw_cell(self.layout.get_intermediario_nome_label())
         self._draw_cell(self.layout.get_intermediario_nome_value(value=nome))
 
-        email = getattr(self, 'interm_email', '-')
+        email = self.interm_email or '-'
         self._draw_cell(self.layout.get_intermediario_email_label())
         self._draw_cell(self.layout.get_intermediario_email_value(value=email))
 
-        endereco = getattr(self, 'interm_x_lgr', '-')
-        log = getattr(self, 'interm_x_lgr', '-')
-        nro = getattr(self, 'interm_nro', '-')
-        comp = getattr(self, 'interm_x_cpl', '-')
-        bairro = getattr(self, 'interm_x_bairro', '-')
+        log = self.interm_x_lgr or '-'
+        nro = self.interm_nro or '-'
+        comp = self.interm_x_cpl or '-'
+        bairro = self.interm_x_bairro or '-'
 
         endereco = f"{log}, {nro}, {comp}, {bairro}"
         
-        import textwrap
-        endereco_linhas = textwrap.wrap(endereco, width=75, break_long_words=True) if len(endereco) > 75 else [endereco]
+        endereco_linhas = _WRAP_75_LONG.wrap(endereco) if len(endereco) > 75 else [endereco]
         len_endereco_linhas = len(endereco_linhas)
         
         endereco_element = self.layout.get_intermediario_endereco_value()
-        line_height = endereco_element.line_height if endereco_element.line_height is not None else endereco_element.height
+        line_height = endereco_element.line_height
         
         if len_endereco_linhas > 1:
             add_height = (len_endereco_linhas - 1) * line_height
@@ -977,29 +1186,14 @@ class Nfse(xFPDF):
         self._draw_cell(self.layout.get_intermediario_endereco_label())
         self._draw_multi_cell(self.layout.get_intermediario_endereco_value(value=endereco_formatado))
 
-        cod_mun = getattr(self, 'interm_c_mun', '-')
-        municipio = ""
-        uf = ""
-
-        if cod_mun != '-':
-            import requests
-
-            response = requests.get(f"https://servicodados.ibge.gov.br/api/v1/localidades/municipios/{cod_mun}")
-            if response.status_code == 200:
-                data = response.json()
-                municipio = data["nome"]
-                uf = data['microrregiao']['mesorregiao']['UF']['sigla']
-            else:
-                municipio = ""
-                uf = ""
+        municipio, uf = self._municipios.get(self.interm_c_mun, ("", ""))
 
         municipio_uf = f"{municipio} - {uf}"
         self._draw_cell(self.layout.get_intermediario_municipio_label())
         self._draw_cell(self.layout.get_intermediario_municipio_value(value=municipio_uf))
 
-        cep = getattr(self, 'interm_cep', '-')
         self._draw_cell(self.layout.get_intermediario_cep_label())
-        self._draw_cell(self.layout.get_intermediario_cep_value(value=formatar_cep(cep)))
+        self._draw_cell(self.layout.get_intermediario_cep_value(value=self._fmt_interm_cep))
 
     def _draw_servico(self):
         """
@@ -1016,27 +1210,16 @@ class Nfse(xFPDF):
         self._draw_cell(self.layout.get_servico_cod_trib_mun_label())
         self._draw_multi_cell(self.layout.get_servico_cod_trib_mun_value('-'))
 
-        local_prest = self.serv_c_loc_prestacao if self.serv_c_loc_prestacao else ""
-
-        import requests
-        response = requests.get(f"https://servicodados.ibge.gov.br/api/v1/localidades/municipios/{local_prest}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            municipio = data["nome"]
-            uf = data['microrregiao']['mesorregiao']['UF']['sigla']
-        else:
-            municipio = ""
-            uf = ""
+        municipio, uf = self._municipios.get(self.serv_c_loc_prestacao, ("", ""))
 
         municipio_uf = f"{municipio} - {uf}"
         self._draw_cell(self.layout.get_servico_local_label())
         self._draw_cell(self.layout.get_servico_local_value(value=municipio_uf if municipio_uf else ""))
 
         pais_prest = self.serv_c_pais_prestacao if self.serv_c_pais_prestacao else ""
-        pais_prest = PAISES_ISO.get(pais_prest, '')
+        pais_prest = _PAIS(pais_prest, '')
         self._draw_cell(self.layout.get_servico_pais_label())
-        self._draw_cell(self.layout.get_servico_pais_value(pais_prest), value=pais_prest)
+        self._draw_cell(self.layout.get_servico_pais_value(pais_prest))
 
         desc_list = self.serv_x_desc_serv.split('\n')[:6]
         len_desc_list = len(desc_list)
@@ -1044,21 +1227,17 @@ class Nfse(xFPDF):
         # Obtém o elemento para pegar o line_height correto
         desc_element = self.layout.get_servico_desc_value()
         # line_height padrão é 4mm (do height do elemento)
-        line_height = desc_element.line_height if desc_element.line_height is not None else desc_element.height
+        line_height = desc_element.line_height
         
         # Calcula altura adicional: considera apenas linhas além da primeira
         # (a primeira linha já está no espaço base da seção)
         if len_desc_list > 1:
             # Altura adicional = (número de linhas - 1) * line_height
             primeiro_elemento = desc_list[0].strip()
-            resto_dos_elementos = [desc.strip() for desc in desc_list[1:] if desc]
-            
             # juntar o resto dos elementos
-            texto_resto = " ".join(resto_dos_elementos)
-
-            import textwrap
+            texto_resto = " ".join(desc.strip() for desc in desc_list[1:] if desc)
 
-            lista_linhas = textwrap.wrap(texto_resto, width=160 , break_long_words=False) if texto_resto and len(texto_resto) > 160 else ([texto_resto] if texto_resto else [])
+            lista_linhas = _WRAP_160.wrap(texto_resto) if texto_resto and len(texto_resto) > 160 else ([texto_resto] if texto_resto else [])
             
             lista_final = [primeiro_elemento] + lista_linhas
 
@@ -1073,7 +1252,7 @@ class Nfse(xFPDF):
             "servico": add_height
         })
 
-        desc_serv = "\n".join([desc.strip() for desc in lista_final if desc])
+        desc_serv = "\n".join(desc.strip() for desc in lista_final if desc)
         self._draw_cell(self.layout.get_servico_desc_label())
         self._draw_multi_cell(self.layout.get_servico_desc_value(value=desc_serv if desc_serv else ""))
 
@@ -1081,243 +1260,168 @@ class Nfse(xFPDF):
         """
         Desenha a seção Tributação Municipal com os dados da tributação municipal.
         """
-        self._draw_cell(self.layout.get_trib_mun_title())
-
-        trib_issqn = de_para_trib_issqn(getattr(self, 'trib_trib_issqn', ''))
-        self._draw_cell(self.layout.get_trib_mun_issqn_label())
-        self._draw_cell(self.layout.get_trib_mun_issqn_value(de_para_trib_issqn(trib_issqn)))
-
-        pais_result = PAISES_ISO.get(self.trib_pais_result, '') if self.trib_pais_result else "-"
-        self._draw_cell(self.layout.get_trib_mun_pais_result_serv_label())
-        self._draw_cell(self.layout.get_trib_mun_pais_result_serv_value(pais_result))
-
+        layout = self.layout
+        self._draw_cell(layout.get_trib_mun_title())
 
-        inc_issqn = getattr(self, 'trib_v_bc_bm', None) or ""
-        municipio = ""
-        uf = ""
-
-        if inc_issqn != "": 
-            try:
-
-                import requests
-                response = requests.get(f"https://servicodados.ibge.gov.br/api/v1/localidades/municipios/{inc_issqn}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    municipio = data["nome"]
-                    uf = data['microrregiao']['mesorregiao']['UF']['sigla']
-                else:
-                    municipio = ""
-                    uf = ""
-            except Exception as e:
-                municipio = ""
-                uf = ""
+        trib_issqn = TRIB_ISSQN.get(self.trib_trib_issqn, '-')
+        pais_result = _PAIS(self.trib_pais_result, '') if self.trib_pais_result else "-"
 
+        municipio, uf = self._municipios.get(self.trib_v_bc_bm, ("", ""))
         municipio_uf = f"{municipio} - {uf}"
-        self._draw_cell(self.layout.get_trib_mun_inc_issqn_label())
-        self._draw_cell(self.layout.get_trib_mun_inc_issqn_value(value=municipio_uf if municipio_uf else "-"))
-
-
-        regime = de_para_reg_esp_trib(getattr(self, 'prest_reg_esp_trib', '-'))
-        self._draw_cell(self.layout.get_trib_regime_label())
-        self._draw_cell(self.layout.get_trib_regime_value(value=regime))
-
-        tipo_imun = de_para_tipo_imun_issqn(getattr(self, 'trib_tp_imun', '-'))
-        self._draw_cell(self.layout.get_trib_tipo_imun_label())
-        self._draw_cell(self.layout.get_trib_tipo_imun_value('-'))
-
-        susp = de_para_susp_issqn(getattr(self, 'trib_tp_susp', 'Não'))
-        self._draw_cell(self.layout.get_trib_susp_issqn_label())
-        self._draw_cell(self.layout.get_trib_susp_issqn_value(value=susp))
-
-        num_proc = getattr(self, 'trib_num_proc_susp', '-')
-        self._draw_cell(self.layout.get_trib_num_proc_susp_issqn_label())
-        self._draw_cell(self.layout.get_trib_num_proc_susp_issqn_value(num_proc))
 
-        benef_mun =  formatar_moeda(getattr(self, 'trib_benef_mun', '-'))
-        self._draw_cell(self.layout.get_trib_benef_mun_label())
-        self._draw_cell(self.layout.get_trib_benef_mun_value(value=benef_mun))
-
-        vl_serv = formatar_moeda(getattr(self, 'dps_v_serv', '-'))
-        self._draw_cell(self.layout.get_trib_valor_serv_label())
-        self._draw_cell(self.layout.get_trib_valor_serv_value(value=vl_serv))
-
-        desc_incond = formatar_moeda(getattr(self, 'trib_v_desc_incond', '-'))
-        self._draw_cell(self.layout.get_trib_desc_incond_label())
-        self._draw_cell(self.layout.get_trib_desc_incond_value(value=desc_incond))
-
-        red_deduc = formatar_moeda(getattr(self, 'v_calc_dr', '-'))
-        self._draw_cell(self.layout.get_trib_total_deduc_label())
-        self._draw_cell(self.layout.get_trib_total_deduc_value(red_deduc))
-
-        bm = formatar_moeda(getattr(self, 'v_bm', '-'))
-        self._draw_cell(self.layout.get_trib_total_bm_label())
-        self._draw_cell(self.layout.get_trib_total_bm_value(value=bm))
-
-        bc_issqn = formatar_moeda(getattr(self, 'v_bc', '-'))
-        self._draw_cell(self.layout.get_trib_bc_issqn_label())
-        self._draw_cell(self.layout.get_trib_bc_issqn_value(value=bc_issqn))
-
-        aliq = getattr(self, 'p_aliq_aplic', '0.00') + '%'
-        self._draw_cell(self.layout.get_trib_aliq_label())
-        self._draw_cell(self.layout.get_trib_aliq_value(value=aliq))
-
-        ret = formatar_moeda(getattr(self, 'v_total_ret', 'Não Retido'))
-        self._draw_cell(self.layout.get_trib_ret_issqn_label())
-        self._draw_cell(self.layout.get_trib_ret_issqn_value(value=ret))
-
-        aliq_num = float(aliq.replace('%', '')) if aliq else 0
-        bc_issqn_num = float(getattr(self, 'v_bc', 0))
-        vl_apr = (aliq_num * bc_issqn_num) / 100
-        vl_apr = round(vl_apr, 2)
-        vl_apr = formatar_moeda(vl_apr)
-        self._draw_cell(self.layout.get_trib_valor_issqn_apurado_label())
-        self._draw_cell(self.layout.get_trib_valor_issqn_apurado_value(value=vl_apr))
+        susp = SUSP_ISSQN.get(self.trib_tp_susp, 'Não')
+        num_proc = self.trib_num_proc_susp or '-'
+
+        self._draw_pairs((
+            (layout.get_trib_mun_issqn_label(), layout.get_trib_mun_issqn_value(trib_issqn)),
+            (layout.get_trib_mun_pais_result_serv_label(), layout.get_trib_mun_pais_result_serv_value(pais_result)),
+            (layout.get_trib_mun_inc_issqn_label(), layout.get_trib_mun_inc_issqn_value(value=municipio_uf if municipio_uf else "-")),
+            (layout.get_trib_regime_label(), layout.get_trib_regime_value(value=self._fmt_reg_esp_trib)),
+            (layout.get_trib_tipo_imun_label(), layout.get_trib_tipo_imun_value('-')),
+            (layout.get_trib_susp_issqn_label(), layout.get_trib_susp_issqn_value(value=susp)),
+            (layout.get_trib_num_proc_susp_issqn_label(), layout.get_trib_num_proc_susp_issqn_value(num_proc)),
+            (layout.get_trib_benef_mun_label(), layout.get_trib_benef_mun_value(value=self._fmt_benef_mun)),
+            (layout.get_trib_valor_serv_label(), layout.get_trib_valor_serv_value(value=self._fmt_v_serv)),
+            (layout.get_trib_desc_incond_label(), layout.get_trib_desc_incond_value(value=self._fmt_desc_incond)),
+            (layout.get_trib_total_deduc_label(), layout.get_trib_total_deduc_value(self._fmt_red_deduc)),
+            (layout.get_trib_total_bm_label(), layout.get_trib_total_bm_value(value=self._fmt_bm)),
+            (layout.get_trib_bc_issqn_label(), layout.get_trib_bc_issqn_value(value=self._fmt_bc_issqn)),
+            (layout.get_trib_aliq_label(), layout.get_trib_aliq_value(value=self._fmt_aliq)),
+            (layout.get_trib_ret_issqn_label(), layout.get_trib_ret_issqn_value(value=self._fmt_ret_issqn)),
+            (layout.get_trib_valor_issqn_apurado_label(), layout.get_trib_valor_issqn_apurado_value(value=self._fmt_vl_apr)),
+        ))
 
 
     def _draw_trib_federal(self):
         """
         Desenha a seção Tributação Federal com os dados da tributação federal.
         """
-        self._draw_cell(self.layout.get_trib_federal_title())
-
-        irrf = formatar_moeda(getattr(self, 'trib_v_ret_irrf', '-'))
-        self._draw_cell(self.layout.get_trib_federal_irrf_label())
-        self._draw_cell(self.layout.get_trib_federal_irrf_value(value=irrf))
-
-        cp = formatar_moeda(getattr(self, 'trib_v_ret_cp', '-'))
-        self._draw_cell(self.layout.get_trib_federal_cp_label())
-        self._draw_cell(self.layout.get_trib_federal_cp_value(value=cp))
-
-        csll = formatar_moeda(getattr(self, 'trib_v_ret_csll', '-'))
-        self._draw_cell(self.layout.get_trib_federal_csll_label())
-        self._draw_cell(self.layout.get_trib_federal_csll_value(value=csll))
+        layout = self.layout
+        self._draw_cell(layout.get_trib_federal_title())
 
-        pis = formatar_moeda(getattr(self, 'trib_v_pis', '-'))
-        self._draw_cell(self.layout.get_trib_federal_pis_label())
-        self._draw_cell(self.layout.get_trib_federal_pis_value(value=pis))
+        ret_pis_cofins = TP_RET_PIS_COFINS.get(self.trib_tp_ret_pis_cofins, '-')
 
-        cofins = formatar_moeda(getattr(self, 'trib_v_cofins', '-'))
-        self._draw_cell(self.layout.get_trib_federal_cofins_label())
-        self._draw_cell(self.layout.get_trib_federal_cofins_value(value=cofins))
-
-        ret_pis_cofins = de_para_tp_ret_pis_cofins(getattr(self, 'trib_tp_ret_pis_cofins', '-'))
-        self._draw_cell(self.layout.get_trib_federal_ret_pis_cofins_label())
-        self._draw_cell(self.layout.get_trib_federal_ret_pis_cofins_value(value=ret_pis_cofins))
-
-        total = formatar_moeda(getattr(self, 'trib_v_tot_trib_fed', '-'))
-        self._draw_cell(self.layout.get_trib_federal_total_label())
-        self._draw_cell(self.layout.get_trib_federal_total_value(value=total))
+        self._draw_pairs((
+            (layout.get_trib_federal_irrf_label(), layout.get_trib_federal_irrf_value(value=self._fmt_irrf)),
+            (layout.get_trib_federal_cp_label(), layout.get_trib_federal_cp_value(value=self._fmt_cp)),
+            (layout.get_trib_federal_csll_label(), layout.get_trib_federal_csll_value(value=self._fmt_csll)),
+            (layout.get_trib_federal_pis_label(), layout.get_trib_federal_pis_value(value=self._fmt_pis)),
+            (layout.get_trib_federal_cofins_label(), layout.get_trib_federal_cofins_value(value=self._fmt_cofins)),
+            (layout.get_trib_federal_ret_pis_cofins_label(), layout.get_trib_federal_ret_pis_cofins_value(value=ret_pis_cofins)),
+            (layout.get_trib_federal_total_label(), layout.get_trib_federal_total_value(value=self._fmt_tot_trib_fed)),
+        ))
 
     def _draw_valor_nfse(self):
         """
         Desenha a seção Valor da NFS-e com os dados do valor da NFS-e.
         """
-        self._draw_cell(self.layout.get_total_nfse_title())
-
-        vl_serv = formatar_moeda(getattr(self, 'dps_v_serv', '-'))
-        self._draw_cell(self.layout.get_total_nfse_vl_servico_label())
-        self._draw_cell(self.layout.get_total_nfse_vl_servico_value(value=vl_serv))
-
-        desc_cond = formatar_moeda(getattr(self, 'trib_v_desc_cond', '-'))
-        self._draw_cell(self.layout.get_total_nfse_desc_cond_label())
-        self._draw_cell(self.layout.get_total_nfse_desc_cond_value(value=desc_cond))
-
-        desc_incond = formatar_moeda(getattr(self, 'trib_v_desc_incond', '-'))
-        self._draw_cell(self.layout.get_total_nfse_desc_incond_label())
-        self._draw_cell(self.layout.get_total_nfse_desc_incond_value(value=desc_incond))
-
-        issqn_ret = formatar_moeda(getattr(self, 'v_total_ret', '-'))
-        self._draw_cell(self.layout.get_total_nfse_issqn_label())
-        self._draw_cell(self.layout.get_total_nfse_issqn_value(value=issqn_ret))
-
-        v_ret_cp = float(getattr(self, 'trib_v_ret_cp', 0) if getattr(self, 'trib_v_ret_cp', 0) else 0)
-        v_ret_irrf = float(getattr(self, 'trib_v_ret_irrf', 0) if getattr(self, 'trib_v_ret_irrf', 0) else 0)
-        v_ret_csll = float(getattr(self, 'trib_v_ret_csll', 0) if getattr(self, 'trib_v_ret_csll', 0) else 0)
-        v_ret_total = v_ret_cp + v_ret_irrf + v_ret_csll
-        v_ret_total = formatar_moeda(v_ret_total)
-
-        self._draw_cell(self.layout.get_total_nfse_irrf_label())
-        self._draw_cell(self.layout.get_total_nfse_irrf_value(value=v_ret_total))
-
-        v_pis = float(getattr(self, 'trib_v_pis', 0) if getattr(self, 'trib_v_pis', 0) else 0)
-        v_cofins = float(getattr(self, 'trib_v_cofins', 0) if getattr(self, 'trib_v_cofins', 0) else 0)
-        v_pis_cofins_total = v_pis + v_cofins
-        v_pis_cofins_total = formatar_moeda(v_pis_cofins_total)
-        self._draw_cell(self.layout.get_total_nfse_pis_label())
-        self._draw_cell(self.layout.get_total_nfse_pis_value(value=v_pis_cofins_total))
-
-        v_liq = formatar_moeda(getattr(self, 'v_liq', '-'))
-        self._draw_cell(self.layout.get_total_nfse_liquido_label())
-        self._draw_cell(self.layout.get_total_nfse_liquido_value(value=v_liq))
+        layout = self.layout
+        self._draw_cell(layout.get_total_nfse_title())
+
+        self._draw_pairs((
+            (layout.get_total_nfse_vl_servico_label(), layout.get_total_nfse_vl_servico_value(value=self._fmt_v_serv)),
+            (layout.get_total_nfse_desc_cond_label(), layout.get_total_nfse_desc_cond_value(value=self._fmt_desc_cond)),
+            (layout.get_total_nfse_desc_incond_label(), layout.get_total_nfse_desc_incond_value(value=self._fmt_desc_incond)),
+            (layout.get_total_nfse_issqn_label(), layout.get_total_nfse_issqn_value(value=self._fmt_issqn_ret)),
+            (layout.get_total_nfse_irrf_label(), layout.get_total_nfse_irrf_value(value=self._fmt_v_ret_total)),
+            (layout.get_total_nfse_pis_label(), layout.get_total_nfse_pis_value(value=self._fmt_v_pis_cofins_total)),
+            (layout.get_total_nfse_liquido_label(), layout.get_total_nfse_liquido_value(value=self._fmt_v_liq)),
+        ))
 
     def _draw_totais(self):
         """
         Desenha a seção Totais com os dados dos totais.
         """
-        self._draw_cell(self.layout.get_totais_title())
-        
-        v_tot_trib_fed = formatar_moeda(getattr(self, 'trib_v_tot_trib_fed', '-'))
-        self._draw_cell(self.layout.get_totais_federais_label())
-        self._draw_cell(self.layout.get_totais_federais_value(value=v_tot_trib_fed))
-        
-        v_tot_trib_est = formatar_moeda(getattr(self, 'trib_v_tot_trib_est', '-'))
-        self._draw_cell(self.layout.get_totais_estaduais_label())
-        self._draw_cell(self.layout.get_totais_estaduais_value(value=v_tot_trib_est))
-        
-        v_tot_trib_mun = formatar_moeda(getattr(self, 'trib_v_tot_trib_mun', '-'))
-        self._draw_cell(self.layout.get_totais_municipais_label())
-        self._draw_cell(self.layout.get_totais_municipais_value(value=v_tot_trib_mun))
+        layout = self.layout
+        self._draw_cell(layout.get_totais_title())
+
+        self._draw_pairs((
+            (layout.get_totais_federais_label(), layout.get_totais_federais_value(value=self._fmt_tot_trib_fed)),
+            (layout.get_totais_estaduais_label(), layout.get_totais_estaduais_value(value=self._fmt_tot_trib_est)),
+            (layout.get_totais_municipais_label(), layout.get_totais_municipais_value(value=self._fmt_tot_trib_mun)),
+        ))
 
     def _draw_info_complementar(self):
         """
         Desenha a seção Informações Complementares com os dados das informações complementares.
         """
-        info_compl = getattr(self, 'serv_x_inf_comp', '-')
+        info_compl = self.serv_x_inf_comp or '-'
 
-        info_compl = info_compl.split('\n')
-        info_compl = [info.strip() for info in info_compl if info]
+        info_compl = " ".join(info.strip() for info in info_compl.split('\n') if info)
 
-        info_compl = " ".join(info_compl)
-
-        import textwrap
-
-        lista_linhas = textwrap.wrap(info_compl, width=160, break_long_words=False) if info_compl and len(info_compl) > 160 else ([info_compl] if info_compl else [])
+        lista_linhas = _WRAP_160.wrap(info_compl) if info_compl and len(info_compl) > 160 else ([info_compl] if info_compl else [])
         
-        texto_final = "\n".join([info.strip() for info in lista_linhas if info])
+        texto_final = "\n".join(info.strip() for info in lista_linhas if info)
         self._draw_cell(self.layout.get_info_complementar_title())
         self._draw_multi_cell(self.layout.get_info_complementar_value(value=texto_final))
     
 
-    def _draw_cell(self, element: TextElement, value: str = None):
-        self.set_font(self.default_font, element.font_style, element.font_size)
-        self.set_xy(element.x, element.y)
-        self.cell(w=element.width or 30, h=element.height,
-                  txt=element.value, border=0, align="L")
+    def _draw_pairs(self, pares):
+        """
+        Desenha pares (label, valor) de elementos já obtidos do layout.
+        Só deve ser usado em seções cujas posições não são recalculadas durante o desenho.
+        Todos os labels são desenhados antes dos valores: as posições são absolutas,
+        e assim a fonte muda uma vez por seção em vez de a cada célula.
+        """
+        draw_cell = self._draw_cell
+        for label, _ in pares:
+            draw_cell(label)
+        for _, valor in pares:
+            draw_cell(valor)
+
+    def _set_font(self, style, size):
+        """
+        Define a fonte apenas quando estilo ou tamanho mudam em relação à última
+        chamada; a maioria das células repete a fonte da anterior.
+        """
+        fonte = (style, size)
+        if fonte != self._fonte_atual:
+            self.set_font(self.default_font, style, size)
+            self._fonte_atual = fonte
+
+    def _draw_cell(self, element: TextElement):
+        """
+        Desenha o texto de uma linha do elemento com text(), que grava o texto
+        direto no conteúdo da página, sem o layout genérico do cell() e sem mover
+        o cursor. A posição reproduz a do cell() alinhado à esquerda: margem
+        interna em x e linha de base no meio da altura da célula.
+        """
+        e = element
+        text = e.value
+        # cell() não desenha nada para texto vazio
+        if not text:
+            return self
+
+        self._set_font(e.font_style, e.font_size)
+        height = e.height if e.height is not None else self.font_size
+        self.text(
+            e.x + self.c_margin,
+            e.y + 0.5 * height + 0.3 * self.font_size,
+            text,
+        )
         return self
 
-    def _draw_multi_cell(self, element: TextElement, value: str = None):
-        self.set_font(self.default_font, element.font_style, element.font_size)
-        self.set_xy(element.x, element.y)
-        
-        # Usa line_height se disponível, senão usa height
-        # No FPDF, o parâmetro 'h' do multi_cell controla o espaçamento entre linhas
-        line_height = element.line_height if element.line_height is not None else element.height
+    def _draw_multi_cell(self, element: TextElement):
+        e = element
+        x = e.x
+        self._set_font(e.font_style, e.font_size)
+        self.set_xy(x, e.y)
         
-        # Se value foi fornecido, usa ele em vez do value do element
-        text = value if value is not None else element.value
+        text = e.value
         
         # Garante que há texto para desenhar
         if not text:
             return self
         
         # Garante que width está definido
-        width = element.width if element.width is not None else self.epw - (element.x - self.l_margin)
+        width = e.width
+        if width is None:
+            width = self._x_direita - x
         
         self.multi_cell(
             w=width, 
-            h=line_height,  # Altura da linha (espaçamento entre linhas)
-            txt=text, 
+            h=e.line_height,  # Altura da linha (espaçamento entre linhas)
+            text=text, 
             border=0, 
             align="L"
         )
@@ -1331,6 +1435,9 @@ class Nfse(xFPDF):
         Args:
             text: Texto da marca d'água (ex: "CANCELADA", "SUBSTITUÍDA", "BLOQUEADA")
         """
+        if not text:
+            return
+
         with self.local_context(
             fill_opacity=0.5,
             text_color=(230, 230, 230),
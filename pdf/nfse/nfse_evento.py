@@ -1,4 +1,5 @@
-import xml.etree.ElementTree as ET
+# lxml faz o parse em C (libxml2)
+from lxml import etree as ET
 
 try:
     from pdf.nfse.de_para import cod_eventos
@@ -6,13 +7,27 @@ except ImportError:
     from de_para import cod_eventos
 
 
+URL_NFSE = "http://www.sped.fazenda.gov.br/nfse"
+
+# Tag qualificada com namespace de cada código de evento -> situação da NFS-e
+_EVENTOS_POR_TAG = {f"{{{URL_NFSE}}}{cod}": situacao for cod, situacao in cod_eventos.items()}
+
+
 class NfseEvento:
 
-    URL = "http://www.sped.fazenda.gov.br/nfse"
+    URL = URL_NFSE
     def __init__(self, xml):
         self.xml = xml
 
-        self.root = ET.fromstring(xml)
+        if isinstance(xml, str):
+            # O lxml não aceita str com declaração de encoding: o texto é reescrito
+            # em UTF-8 e a declaração original (ex.: ISO-8859-1) é ignorada
+            self.root = ET.fromstring(xml.encode("utf-8"), ET.XMLParser(encoding="utf-8"))
+        elif isinstance(xml, bytes):
+            self.root = ET.fromstring(xml)
+        else:
+            # Elemento já parseado pelo chamador
+            self.root = xml
 
         self.eventos = cod_eventos
 
@@ -20,12 +35,9 @@ class NfseEvento:
         infPedReg = self.root.find(f'.//{{{self.URL}}}infPedReg')
 
         if infPedReg is not None:
-            for cod in self.eventos.keys():
-                evento_encontrado = infPedReg.find(f'.//{{{self.URL}}}{cod}')
-                
-                if evento_encontrado is not None:
-                    desc = evento_encontrado.find(f'.//{{{self.URL}}}xDesc')
-
-                    return self.eventos[cod]
+            # Uma única passada pela subárvore, em vez de uma busca por código de evento
+            for elem in infPedReg.iter():
+                situacao = _EVENTOS_POR_TAG.get(elem.tag)
+                if situacao is not None:
+                    return situacao
         return None
-    
\ No newline at end of file
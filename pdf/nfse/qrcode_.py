@@ -1,33 +1,75 @@
+from functools import lru_cache
+
 import qrcode
 
 
-## Trabalhar com a correção de erro M ou Q
+# Com correção de erro L a URL de consulta pública (a chave de acesso de 50
+# dígitos é codificada em modo numérico) cabe na versão 4, uma a menos que com
+# M; a versão é a menor em que o conteúdo cabe (fit=True a partir da 1).
+QR_ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_L
+
+
+@lru_cache(maxsize=128)
+def gerar_qr_code_modulos(qr_code_data, border=1):
+    """
+    Codifica o QR code e reduz a matriz de módulos a trechos horizontais
+    contínuos de módulos escuros. O resultado fica em cache por conteúdo, então
+    uma mesma chave de acesso não é codificada de novo.
+
+    Returns:
+        Tupla (n, trechos): n módulos por lado, borda incluída, e trechos como
+        tuplas (linha, coluna inicial, comprimento).
+    """
+    qr = qrcode.QRCode(
+        error_correction=QR_ERROR_CORRECTION,
+        border=border,
+    )
+    qr.add_data(qr_code_data)
+    qr.make(fit=True)
 
+    matriz = qr.get_matrix()
+    trechos = []
+    for linha, modulos in enumerate(matriz):
+        inicio = None
+        for coluna, escuro in enumerate(modulos):
+            if escuro and inicio is None:
+                inicio = coluna
+            elif not escuro and inicio is not None:
+                trechos.append((linha, inicio, coluna - inicio))
+                inicio = None
+        if inicio is not None:
+            trechos.append((linha, inicio, len(modulos) - inicio))
 
-class Qrcode:
-    def __init__(self, qr_code_data, y_margin_ret, x_offset, y_offset, box_size=10, border=1):
-        self.qr_code_data = qr_code_data
-        self.y_margin_ret = y_margin_ret
-        self.x_offset = x_offset
-        self.y_offset = y_offset
-        self.box_size = box_size
-        self.border = border
+    return len(matriz), tuple(trechos)
 
-    def draw_qr_code(self, image_handler):
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_M,
-            box_size=self.box_size,
-            border=self.border,
-        )
 
-        qr.add_data(self.qr_code_data)
-        qr.make(fit=True)
+def desenhar_qr_code(pdf, qr_code_data, x, y, largura, altura, border=1):
+    """
+    Desenha o QR code como vetor: um retângulo por trecho de módulos escuros,
+    todos preenchidos por um único caminho no conteúdo da página, sem gerar
+    imagem. As coordenadas de cada borda vêm da mesma grade arredondada, então
+    módulos vizinhos se encostam sem frestas.
 
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        qr_img_bytes = qr_img.get_image()
+    Args:
+        pdf: Instância FPDF com a página atual
+        qr_code_data: Conteúdo do QR code
+        x, y: Canto superior esquerdo em unidades do documento
+        largura, altura: Tamanho do QR code, borda incluída
+        border: Borda em módulos
+    """
+    n, trechos = gerar_qr_code_modulos(qr_code_data, border)
+    if not trechos:
+        return
 
-        num_x = self.y_margin_ret + self.x_offset
-        num_y = self.t_margin + self.y_offset
+    k = pdf.k
+    topo = pdf.h - y
+    xs = [round((x + i * largura / n) * k, 2) for i in range(n + 1)]
+    ys = [round((topo - i * altura / n) * k, 2) for i in range(n + 1)]
 
-        image_handler.image(qr_img_bytes, x=num_x + 1, y=num_y + 1, w=self.box_size, h=self.box_size)
\ No newline at end of file
+    retangulos = [
+        f"{xs[coluna]:.2f} {ys[linha + 1]:.2f} "
+        f"{xs[coluna + comprimento] - xs[coluna]:.2f} {ys[linha] - ys[linha + 1]:.2f} re"
+        for linha, coluna, comprimento in trechos
+    ]
+    # Preenchimento preto isolado entre q/Q para não alterar a cor de preenchimento do documento
+    pdf._out("q 0 g " + " ".join(retangulos) + " f Q")
@@ -1,16 +1,176 @@
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+from itertools import accumulate
+import threading
+
 from fpdf import FPDF
+from fpdf.enums import MethodReturnValue, XPos, YPos
+
+# Arguments of xFPDF.text_box, for drawing many boxes with xFPDF.text_boxes
+TextBoxSpec = namedtuple(
+    "TextBoxSpec", ["text", "text_align", "h_line", "x", "y", "w", "h", "border"], defaults=[False]
+)
+
+# Single character widths of the core fonts, shared by every xFPDF instance
+_CORE_FONT_CHAR_WIDTHS = {}
+# Width of the widest glyph of each core font state
+_CORE_FONT_MAX_WIDTHS = {}
+
+# Lines of the texts already broken by text_box with core fonts, least recently used first
+_TEXT_BOX_LINES = OrderedDict()
+_TEXT_BOX_LINES_MAX = 1024
+_TEXT_BOX_LINES_LOCK = threading.Lock()
 
 
 class xFPDF(FPDF):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Single character widths per TTF font state, filled on demand
+        self._char_widths = {}
+
+    def _font_state(self):
+        # Widths depend on font, size, stretching and spacing; one table per combination
+        key = (
+            self.font_family,
+            self.font_style,
+            self.font_size_pt,
+            self.font_stretching,
+            self.char_spacing,
+        )
+        if self.is_ttf_font:
+            return key
+        # Unit and encoding also change the widths of the core fonts
+        return key + (self.k, self.core_fonts_encoding)
+
+    def _char_width_table(self):
+        key = self._font_state()
+        if self.is_ttf_font:
+            # TTF fonts are registered per document and may differ between instances
+            tables = self._char_widths
+        else:
+            # Core font metrics are built into fpdf2, so the tables are shared by
+            # every document in the process
+            tables = _CORE_FONT_CHAR_WIDTHS
+        table = tables.get(key)
+        if table is None:
+            table = tables[key] = {}
+        return table
+
+    def _max_char_width(self):
+        # Width of the widest glyph of the current core font, an upper bound for
+        # any character; None for TTF fonts
+        if self.is_ttf_font:
+            return None
+        key = self._font_state()
+        width = _CORE_FONT_MAX_WIDTHS.get(key)
+        if width is None:
+            widths = self.current_font.cw
+            widest = max(widths, key=widths.get)
+            # The metrics table is already in the encoded form, so no normalization
+            width = _CORE_FONT_MAX_WIDTHS[key] = self.get_string_width(widest, normalized=True)
+        return width
+
+    def _char_width(self, char, table=None):
+        if table is None:
+            table = self._char_width_table()
+        width = table.get(char)
+        if width is None:
+            width = table[char] = self.get_string_width(char)
+        return width
+
+    def _string_width(self, text):
+        # Without text shaping (no kerning or ligatures) the width of a string
+        # is the sum of the widths of its characters
+        if self.text_shaping:
+            return self.get_string_width(text)
+        table = self._char_width_table()
+        char_width = self._char_width
+        return sum(char_width(char, table) for char in text)
+
     def long_field(self, text="", limit=0):
         # Take care of long field
         if not text:
             return ""
 
-        while self.get_string_width(text) > limit:
+        # Fits without measuring when even the widest glyph repeated would fit
+        max_width = self._max_char_width()
+        if max_width is not None and len(text) * max_width <= limit:
+            return text
+
+        # Same result as cutting 4 characters and appending "..." until it fits:
+        # the longest prefix of text[:-4] that fits next to "...", without
+        # trailing spaces. Prefix widths only grow with the length, so the cut
+        # is found by binary search instead of shrinking and measuring again.
+        if self.text_shaping:
+            if self.get_string_width(text) <= limit:
+                return text
+            available = limit - self.get_string_width("...")
+            candidate = text[:-4]
+            low, high = 0, len(candidate)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self.get_string_width(candidate[:middle]) <= available:
+                    low = middle
+                else:
+                    high = middle - 1
             # text = text[:-2] + u'\u2026'
-            text = "%s..." % text[:-4].rstrip()
-        return text
+            return "%s..." % candidate[:low].rstrip()
+
+        table = self._char_width_table()
+        char_width = self._char_width
+        # Only the characters that can fit need measuring: the width of an average
+        # glyph estimates how many they are, and the estimate is extended in
+        # chunks of the same size until the limit is passed or the text ends
+        chunk_size = max(int(limit / char_width("a", table)) + 4, 4)
+        prefix_widths = []
+        total = 0.0
+        while total <= limit and len(prefix_widths) < len(text):
+            chunk = text[len(prefix_widths):len(prefix_widths) + chunk_size]
+            prefix_widths.extend(
+                list(accumulate((char_width(char, table) for char in chunk), initial=total))[1:]
+            )
+            total = prefix_widths[-1]
+        if total <= limit:
+            return text
+
+        available = limit - self._string_width("...")
+        end = bisect_right(prefix_widths, available, 0, min(max(len(text) - 4, 0), len(prefix_widths)))
+        # text = text[:-2] + u'\u2026'
+        return "%s..." % text[:end].rstrip()
+
+    def _text_box_lines(self, text, h_line, w):
+        # Line breaking only depends on the text, the width and the font state,
+        # so with core fonts the lines are reused by every box and document
+        # that repeats the same text (mostly fixed labels). With w=0 the width
+        # runs from the current x to the right margin, so those are not cached
+        key = None
+        if w and not self.is_ttf_font and not self.text_shaping:
+            key = (text, w, self.c_margin) + self._font_state()
+            with _TEXT_BOX_LINES_LOCK:
+                lines = _TEXT_BOX_LINES.get(key)
+                if lines is not None:
+                    _TEXT_BOX_LINES.move_to_end(key)
+                    return lines
+
+        lines = tuple(
+            self.multi_cell(
+                w=w,
+                h=h_line,
+                text=text,
+                border=0,
+                align="C",
+                fill=False,
+                split_only=False,
+                dry_run=True,
+                output=MethodReturnValue.LINES,
+            )
+        )
+        if key is not None:
+            with _TEXT_BOX_LINES_LOCK:
+                _TEXT_BOX_LINES[key] = lines
+                if len(_TEXT_BOX_LINES) > _TEXT_BOX_LINES_MAX:
+                    _TEXT_BOX_LINES.popitem(last=False)
+        return lines
 
     def text_box(self, text, text_align, h_line, x, y, w, h, border=False):
         if border:
@@ -20,21 +180,47 @@ class xFPDF(FPDF):
                 w=w,
                 h=h,
             )
-        lines = self.multi_cell(
-            w=w,
-            h=h_line,
-            text=text,
-            border=0,
-            align="C",
-            fill=False,
-            split_only=False,
-            dry_run=True,
-            output=("LINES"),
-        )
+        if not text or (not text.strip() and "\n" not in text):
+            # Nothing visible to write: only leaves the cursor where the single
+            # (blank) line would have left it
+            self.set_xy(x=x + w, y=y + (h + h_line) / 2)
+            return
+        lines = self._text_box_lines(text, h_line, w)
         total_text_height = len(lines) * h_line
         # Calculates the initial vertical position to center the text in the box
         start_y = y + (h - total_text_height) / 2
         self.set_xy(x=x, y=start_y)
-        self.multi_cell(
-            w=w, h=h_line, text=text, border=0, align=text_align, fill=False
-        )
+        if text_align == "J":
+            # cell() cannot justify, so the text is broken again with the right alignment
+            self.multi_cell(
+                w=w, h=h_line, text=text, border=0, align=text_align, fill=False
+            )
+            return
+
+        # Draws the lines already broken by the dry run instead of breaking the text again
+        last_line = len(lines) - 1
+        for index, line in enumerate(lines):
+            self.cell(
+                w=w,
+                h=h_line,
+                text=line,
+                border=0,
+                align=text_align,
+                fill=False,
+                new_x=XPos.RIGHT if index == last_line else XPos.LEFT,
+                new_y=YPos.NEXT,
+            )
+        if text.endswith("\n"):
+            # multi_cell() also moves past a trailing line break
+            self.ln()
+
+    def text_boxes(self, boxes):
+        # Same as calling text_box for each box (TextBoxSpec or a tuple of the
+        # same arguments), but all borders are stroked first and then all the
+        # texts are written, instead of alternating rectangles and text
+        boxes = [TextBoxSpec(*box) for box in boxes]
+        for box in boxes:
+            if box.border:
+                self.rect(x=box.x, y=box.y, w=box.w, h=box.h)
+        for box in boxes:
+            self.text_box(box.text, box.text_align, box.h_line, box.x, box.y, box.w, box.h)